@@ -6,9 +6,19 @@ Handles Smartsheet webhooks and orchestrates folder/notebook creation.
 import logging
 import json
 import azure.functions as func
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Callable
 import traceback
 import sys
+import time
+import functools
+import operator
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import utility functions from onenote_manager
 try:
@@ -28,57 +38,37 @@ except ImportError:
         sanitized = sanitized.strip()
         return sanitized if sanitized else 'Untitled'
 
-# Configure logging with more detailed output
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging with more detailed output; the Functions host normally
+# installs root handlers already, so only configure when running standalone
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
 logger = logging.getLogger(__name__)
 
 # Import modules with better error handling
 try:
     from src.config import config
-    logger.info("Successfully imported config")
-except Exception as e:
-    logger.error(f"Failed to import config: {e}")
-    logger.error(traceback.format_exc())
-    raise
-
-try:
     from src.smartsheet_listener import smartsheet_listener
-    logger.info("Successfully imported smartsheet_listener")
-except Exception as e:
-    logger.error(f"Failed to import smartsheet_listener: {e}")
-    logger.error(traceback.format_exc())
-    raise
-
-try:
     from src.folder_manager import folder_manager
-    logger.info("Successfully imported folder_manager")
-except Exception as e:
-    logger.error(f"Failed to import folder_manager: {e}")
-    logger.error(traceback.format_exc())
-    raise
-
-try:
     from src.onenote_manager import onenote_manager
-    logger.info("Successfully imported onenote_manager")
+    from src.storage import storage_client, TEMPLATE_FIELDS
+    from src.graph_client import graph_client, submit_in_context
+    from src.smartsheet_updater import smartsheet_updater
+    logger.info("Successfully imported application modules")
 except Exception as e:
-    logger.error(f"Failed to import onenote_manager: {e}")
+    logger.error("Failed to import application modules: %s", e)
     logger.error(traceback.format_exc())
     raise
 
-try:
-    from src.storage import storage_client
-    logger.info("Successfully imported storage_client")
-except Exception as e:
-    logger.error(f"Failed to import storage_client: {e}")
-    logger.error(traceback.format_exc())
-    raise
+# Shared worker pool for overlapping independent Graph call chains within a request
+_executor = ThreadPoolExecutor(max_workers=4)
 
-# Validate configuration at startup
+# Validate configuration once at startup; warm invocations reuse the result
 logger.info("Validating configuration...")
-if not config.validate():
+_CONFIG_OK = config.validate()
+if not _CONFIG_OK:
     logger.error("Configuration validation failed. Check environment variables.")
     logger.error("Required fields: BVC_ONENOTE_INGEST_BOT_ID, "
                 "BVC_ONENOTE_INGEST_BOT_KEY, BVC_BOT_REFRESH_TOKEN, "
@@ -87,6 +77,96 @@ if not config.validate():
 else:
     logger.info("Configuration validation successful")
 
+# Environment-derived values that never change within a process
+try:
+    _SHEET_ID: Optional[int] = int(config.SMTSHEET_ID) if config.SMTSHEET_ID else None
+except ValueError:
+    logger.error("SMTSHEET_ID is not a valid sheet ID: %s", config.SMTSHEET_ID)
+    _SHEET_ID = None
+_WEBHOOK_SECRET = (config.FUNCTION_KEY or "").encode('utf-8')  # Function key doubles as webhook secret
+
+# Constant responses are built once and returned by reference
+_OK_RESPONSE = func.HttpResponse("OK", status_code=200)
+_CONFIG_ERROR_RESPONSE = func.HttpResponse("Configuration error", status_code=500)
+_INVALID_BODY_RESPONSE = func.HttpResponse("Invalid request body", status_code=400)
+
+
+def _dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize a response payload to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+
+def _peek_challenge(body: bytes) -> Optional[str]:
+    """
+    Return the challenge string if the body is a Smartsheet verification challenge.
+    
+    Args:
+        body: Raw request body
+        
+    Returns:
+        Optional[str]: Challenge to echo back, or None for any other payload
+    """
+    if b'"challenge"' not in body[:256]:
+        return None
+    try:
+        data = orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or data.get('eventType') != 'WEBHOOK_CHALLENGE':
+        return None
+    challenge = data.get('challenge')
+    return challenge if isinstance(challenge, str) and challenge else None
+
+
+# Handlers in flight keyed by (event type, row id); duplicate deliveries wait on the first
+_inflight_events: Dict[Tuple[str, Any], Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _run_coalesced(handler: Callable[[Dict[str, Any]], func.HttpResponse], event_data: Dict[str, Any]) -> func.HttpResponse:
+    """
+    Run an event handler, sharing its response with identical concurrent events.
+    
+    Args:
+        handler: Event handler to run
+        event_data: Processed webhook event data
+        
+    Returns:
+        func.HttpResponse: Response from the handler (or from the in-flight duplicate)
+    """
+    project_info = event_data.get('project_info')
+    row_id = project_info.row_id if project_info is not None else None
+    if row_id is None:
+        return handler(event_data)
+    key = (event_data.get('type'), row_id)
+    with _inflight_lock:
+        future = _inflight_events.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _inflight_events[key] = future
+    if not is_owner:
+        logger.info("Event %s for row %s already in flight, waiting for its result", key[0], row_id)
+        return future.result()
+    try:
+        response = handler(event_data)
+        future.set_result(response)
+        return response
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight_events.pop(key, None)
+
+
+# Health snapshot is reprobed at most every _HEALTH_TTL seconds
+_HEALTH_TTL = 10
+_health_probed_at = 0.0
+_health_body: Optional[bytes] = None
+
 
 def main(req: func.HttpRequest) -> func.HttpResponse:
     """
@@ -102,47 +182,52 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
         logger.info("Function execution started")
         
         # Validate configuration
-        if not config.validate():
+        if not _CONFIG_OK:
             logger.error("Configuration validation failed")
-            return func.HttpResponse(
-                "Configuration error",
-                status_code=500
-            )
+            return _CONFIG_ERROR_RESPONSE
         
         # Get request body
         try:
-            body = req.get_body().decode('utf-8')
-            logger.info(f"Received request body length: {len(body)}")
-            logger.info(f"Request body content: {body[:500]}...")  # Log first 500 chars
+            # Keep the raw bytes; the listener parses and signs them without a full decode
+            body = req.get_body()
+            logger.info("Received request body length: %s", len(body))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Request body head: %r", body[:500])
         except Exception as e:
-            logger.error(f"Failed to read request body: {e}")
+            logger.error("Failed to read request body: %s", e)
+            return _INVALID_BODY_RESPONSE
+        
+        # Answer verification challenges before signature checks and dedupe
+        challenge = _peek_challenge(body)
+        if challenge is not None:
+            logger.info("Responding to webhook challenge")
             return func.HttpResponse(
-                "Invalid request body",
-                status_code=400
+                challenge,
+                status_code=200,
+                mimetype='text/plain'
             )
         
         # Get webhook signature if available
         signature = req.headers.get('Smartsheet-Hook-Signature')
-        webhook_secret = config.FUNCTION_KEY or ""  # Use function key as webhook secret
-        
-        logger.info(f"Processing webhook with signature: {signature is not None}")
-        logger.info(f"Webhook secret available: {bool(webhook_secret)}")
+        logger.info("Processing webhook with signature: %s", signature is not None)
+        logger.info("Webhook secret available: %s", bool(_WEBHOOK_SECRET))
         
         # Process webhook event
         try:
             event_data = smartsheet_listener.process_webhook_event(
                 payload=body,
                 signature=signature or "",
-                webhook_secret=webhook_secret or ""
+                webhook_secret=_WEBHOOK_SECRET
             )
-            logger.info(f"Webhook event processed, result: {event_data is not None}")
+            logger.info("Webhook event processed, result: %s", event_data is not None)
             if event_data:
-                logger.info(f"Event type: {event_data.get('type')}")
-                logger.info(f"Project info: {event_data.get('project_info', {}).get('project_id', 'N/A')}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Event type: %s", event_data.get('type'))
+                    logger.debug("Project info: %s", getattr(event_data.get('project_info'), 'project_id', 'N/A'))
             else:
                 logger.warning("Webhook processing returned None - no relevant event data")
         except Exception as e:
-            logger.error(f"Failed to process webhook event: {e}")
+            logger.error("Failed to process webhook event: %s", e)
             logger.error(traceback.format_exc())
             return func.HttpResponse(
                 f"Webhook processing error: {str(e)}",
@@ -151,10 +236,7 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
         
         if not event_data:
             logger.info("No relevant event data found, returning 200")
-            return func.HttpResponse(
-                "OK",
-                status_code=200
-            )
+            return _OK_RESPONSE
         
         # Handle webhook challenge
         if event_data.get('type') == 'challenge':
@@ -165,25 +247,27 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
                 mimetype='text/plain'
             )
         
+        # Correlate this invocation's Graph calls in Microsoft's request logs
+        request_id = str(uuid.uuid4())
+        graph_client.set_request_id(request_id)
+        logger.info("Graph client-request-id: %s", request_id)
+        
         # Handle project type change event
         if event_data.get('type') == 'project_type_change':
             logger.info("Handling project type change event")
-            return handle_project_type_change(event_data)
+            return _run_coalesced(handle_project_type_change, event_data)
         
         # Handle closed won deal event
         if event_data.get('type') == 'closed_won_deal':
             logger.info("Handling closed won deal event")
-            return handle_closed_won_deal(event_data)
+            return _run_coalesced(handle_closed_won_deal, event_data)
         
         # Unknown event type
-        logger.warning(f"Unknown event type: {event_data.get('type')}")
-        return func.HttpResponse(
-            "OK",
-            status_code=200
-        )
+        logger.warning("Unknown event type: %s", event_data.get('type'))
+        return _OK_RESPONSE
         
     except Exception as e:
-        logger.error(f"Function execution failed: {e}")
+        logger.error("Function execution failed: %s", e)
         logger.error(traceback.format_exc())
         return func.HttpResponse(
             f"Internal server error: {str(e)}",
@@ -200,9 +284,8 @@ def handle_project_type_change(event_data: Dict[str, Any]) -> func.HttpResponse:
         func.HttpResponse: Response to Smartsheet
     """
     try:
-        project_info = event_data.get('project_info', {})
-        project_type = project_info.get('project_type')
-        # project_name = project_info.get('project_name')  # Unused variable
+        project_info = event_data['project_info']
+        project_type = project_info.project_type
         if not project_type:
             logger.error("Missing ProjectType in event data")
             return func.HttpResponse(
@@ -212,48 +295,52 @@ def handle_project_type_change(event_data: Dict[str, Any]) -> func.HttpResponse:
         # Look up project metadata from BVCSSProjects
         project = storage_client.get_project_by_type(project_type)
         if not project:
-            logger.error(f"No project metadata found for ProjectType: {project_type}")
+            logger.error("No project metadata found for ProjectType: %s", project_type)
             return func.HttpResponse(
                 f"No project metadata found for ProjectType: {project_type}",
                 status_code=400
             )
-        logger.info(f"Processing project type change for: {project.project_name} ({project_type})")
-        # Copy template folders using metadata
-        folder_results = copy_template_folders(
-            parent_drive_id=project.drive_id,  # Destination drive (project)
-            parent_folder_id=project.job_folder_id,  # Destination parent folder
-            project_category=project.project_type,  # Or whatever field is used
-            project_name=project.project_name
-        )
+        logger.info("Processing project type change for: %s (%s)", project.project_name, project_type)
         # Create OneNote notebook, section, and page using metadata
         # Construct section name as "ProjectName - Opp ID"
-        opp_id = project_info.get('3408182019051396', 'Unknown')  # SMT_PROJECT_ID from .env
+        opp_id = project_info.cells.get('3408182019051396', 'Unknown')  # SMT_PROJECT_ID from .env
         section_name = f"{project.project_name} - {opp_id}"
         
-        notebook_result = create_project_notebook_and_section_with_metadata(
+        # The OneNote chain is independent of the folder copy, so run it concurrently
+        notebook_future = submit_in_context(
+            _executor,
+            create_project_notebook_and_section_with_metadata,
             site_id=project.site_id,
             parent_folder_id=project.parent_folder_id,
             notebook_name=project.company_name,  # Use CompanyName for notebook name
             section_name=section_name,           # Use "ProjectName - Opp ID" for section name
-            smartsheet_data=project_info         # Pass all available Smartsheet/project data
+            smartsheet_data=project_info.to_dict()  # Pass all available Smartsheet/project data
         )
+        # Copy template folders using metadata
+        folder_results = copy_template_folders(
+            parent_drive_id=project.drive_id,  # Destination drive (project)
+            parent_folder_id=project.job_folder_id,  # Destination parent folder
+            project_category=project.project_type,  # Or whatever field is used
+            project_name=project.project_name
+        )
+        notebook_result = notebook_future.result()
         # Prepare response
         response_data = {
             'project_name': project.project_name,
             'project_type': project_type,
             'folder_results': folder_results,
             'notebook_result': notebook_result,
-            'row_id': project_info.get('row_id'),
+            'row_id': project_info.row_id,
             'status': 'success'
         }
-        logger.info(f"Successfully processed project '{project.project_name}' of type '{project_type}'")
+        logger.info("Successfully processed project '%s' of type '%s'", project.project_name, project_type)
         return func.HttpResponse(
-            json.dumps(response_data),
+            body=_dumps(response_data),
             status_code=200,
             mimetype='application/json'
         )
     except Exception as e:
-        logger.error(f"Failed to handle project type change: {e}")
+        logger.error("Failed to handle project type change: %s", e)
         return func.HttpResponse(
             f"Failed to process project type change: {str(e)}",
             status_code=500
@@ -262,9 +349,9 @@ def handle_project_type_change(event_data: Dict[str, Any]) -> func.HttpResponse:
 
 def handle_closed_won_deal(event_data: Dict[str, Any]) -> func.HttpResponse:
     try:
-        project_info = event_data.get('project_info', {})
-        project_id = project_info.get('project_id')
-        project_type = project_info.get('project_type')
+        project_info = event_data['project_info']
+        project_id = project_info.project_id
+        project_type = project_info.project_type
         if not project_id or not project_type:
             logger.error("Missing project_id or project_type in event data")
             return func.HttpResponse(
@@ -274,12 +361,49 @@ def handle_closed_won_deal(event_data: Dict[str, Any]) -> func.HttpResponse:
         # Look up project metadata from BVCSSProjects using project_id as RowKey
         project = storage_client.get_project_by_type(project_id)
         if not project:
-            logger.error(f"No project metadata found for project_id: {project_id}")
+            logger.error("No project metadata found for project_id: %s", project_id)
             return func.HttpResponse(
                 f"No project metadata found for project_id: {project_id}",
                 status_code=400
             )
-        logger.info(f"Processing Closed Won deal for project_id: {project_id}, project_type: {project_type}")
+        logger.info("Processing Closed Won deal for project_id: %s, project_type: %s", project_id, project_type)
+        # Create OneNote notebook, section, and page using metadata
+        # Construct section name as "Opp ID - ProjectName" (reversed format)
+        opp_id_cell = project_info.cells.get('3408182019051396', 'Unknown')  # Opportunity ID
+        project_name_cell = project_info.cells.get('3534360453271428', project.project_name)  # Project Name
+        
+        # Extract string values from cells
+        opp_id_str = get_cell_str(opp_id_cell)
+        project_name_str = get_cell_str(project_name_cell)
+        
+        # Build section name
+        if opp_id_str and opp_id_str != 'Unknown':
+            section_name = f"{opp_id_str} - {project_name_str}"
+        else:
+            section_name = project_name_str
+        
+        # Sanitize the section name
+        section_name = sanitize_onenote_name(section_name)
+        
+        logger.info("Formatted section name: '%s'", section_name)
+        
+        # Format notebook name using utility functions
+        notebook_name = sanitize_onenote_name(project.company_name)
+        notebook_name = f"{notebook_name} - Public"
+        
+        logger.info("Formatted notebook name: '%s'", notebook_name)
+        
+        # The OneNote chain is independent of the folder copy, so run it concurrently
+        notebook_future = submit_in_context(
+            _executor,
+            create_project_notebook_and_section_with_metadata,
+            site_id=project.site_id,
+            parent_folder_id=project.parent_folder_id,
+            notebook_name=notebook_name,         # Use sanitized CompanyName for notebook name
+            section_name=section_name,           # Use "Opp ID - ProjectName" for section name
+            smartsheet_data=project_info.to_dict()  # Pass all available Smartsheet/project data
+        )
+
         # Copy template folders using metadata, but skip if folder already exists
         folder_results = copy_template_folders_skip_existing(
             parent_drive_id=project.drive_id,  # Destination drive (project)
@@ -291,13 +415,10 @@ def handle_closed_won_deal(event_data: Dict[str, Any]) -> func.HttpResponse:
         # Find Submittals folder and update Smartsheet with its URL
         submittals_url = None
         try:
-            from src.folder_manager import folder_manager
-            from src.smartsheet_updater import smartsheet_updater
-            
             # Get the project name from Smartsheet data
-            project_name = project_info.get('3534360453271428', project.project_name)  # Project Name column
-            row_id = project_info.get('row_id')
-            sheet_id = project_info.get('sheet_id')
+            project_name = project_info.cells.get('3534360453271428', project.project_name)  # Project Name column
+            row_id = project_info.row_id
+            sheet_id = project_info.sheet_id
             
             if row_id and sheet_id:
                 # Find the Submittals folder and get its URL
@@ -316,7 +437,7 @@ def handle_closed_won_deal(event_data: Dict[str, Any]) -> func.HttpResponse:
                     )
                     
                     if success:
-                        logger.info(f"Successfully updated Smartsheet with Submittals folder URL: {submittals_url}")
+                        logger.info("Successfully updated Smartsheet with Submittals folder URL: %s", submittals_url)
                     else:
                         logger.error("Failed to update Smartsheet with Submittals folder URL")
                 else:
@@ -325,72 +446,38 @@ def handle_closed_won_deal(event_data: Dict[str, Any]) -> func.HttpResponse:
                 logger.warning("Missing row_id or sheet_id, cannot update Smartsheet with Submittals folder URL")
                 
         except Exception as e:
-            logger.error(f"Error updating Smartsheet with Submittals folder URL: {e}")
+            logger.error("Error updating Smartsheet with Submittals folder URL: %s", e)
             # Don't fail the entire operation, just log the error
-        
-        # Create OneNote notebook, section, and page using metadata
-        # Construct section name as "Opp ID - ProjectName" (reversed format)
-        opp_id_cell = project_info.get('3408182019051396', 'Unknown')  # Opportunity ID
-        project_name_cell = project_info.get('3534360453271428', project.project_name)  # Project Name
-        
-        # Extract string values from cells
-        opp_id_str = get_cell_str(opp_id_cell)
-        project_name_str = get_cell_str(project_name_cell)
-        
-        # Build section name
-        if opp_id_str and opp_id_str != 'Unknown':
-            section_name = f"{opp_id_str} - {project_name_str}"
-        else:
-            section_name = project_name_str
-        
-        # Sanitize the section name
-        section_name = sanitize_onenote_name(section_name)
-        
-        logger.info(f"Formatted section name: '{section_name}'")
-        
-        # Format notebook name using utility functions
-        notebook_name = sanitize_onenote_name(project.company_name)
-        notebook_name = f"{notebook_name} - Public"
-        
-        logger.info(f"Formatted notebook name: '{notebook_name}'")
-        
-        notebook_result = create_project_notebook_and_section_with_metadata(
-            site_id=project.site_id,
-            parent_folder_id=project.parent_folder_id,
-            notebook_name=notebook_name,         # Use sanitized CompanyName for notebook name
-            section_name=section_name,           # Use "Opp ID - ProjectName" for section name
-            smartsheet_data=project_info         # Pass all available Smartsheet/project data
-        )
+
+        notebook_result = notebook_future.result()
         response_data = {
             'project_id': project_id,
             'project_type': project_type,
             'folder_results': folder_results,
             'notebook_result': notebook_result,
             'submittals_folder_url': submittals_url,
-            'row_id': project_info.get('row_id'),
+            'row_id': project_info.row_id,
             'status': 'success'
         }
-        logger.info(f"Successfully processed Closed Won deal for project_id: {project_id}")
+        logger.info("Successfully processed Closed Won deal for project_id: %s", project_id)
         return func.HttpResponse(
-            json.dumps(response_data),
+            body=_dumps(response_data),
             status_code=200,
             mimetype='application/json'
         )
     except Exception as e:
-        logger.error(f"Failed to handle Closed Won deal: {e}")
+        logger.error("Failed to handle Closed Won deal: %s", e)
         return func.HttpResponse(
             f"Failed to process Closed Won deal: {str(e)}",
             status_code=500
         )
 
 
+_template_getter = operator.attrgetter(*TEMPLATE_FIELDS)
+
+
 def template_to_dict(template):
-    return {
-        "partition_key": getattr(template, "partition_key", None),
-        "row_key": getattr(template, "row_key", None),
-        "template_folder_id": getattr(template, "template_folder_id", None),
-        "site_id": getattr(template, "site_id", None)
-    }
+    return dict(zip(TEMPLATE_FIELDS, _template_getter(template)))
 
 
 def copy_template_folders(
@@ -412,7 +499,7 @@ def copy_template_folders(
         Dict[str, Any]: Copy operation results
     """
     try:
-        logger.info(f"Copying templates for category '{project_category}'")
+        logger.info("Copying templates for category '%s'", project_category)
         
         # Copy templates using folder manager
         results = folder_manager.copy_templates_for_category(
@@ -422,33 +509,33 @@ def copy_template_folders(
             project_name=project_name
         )
         
-        # Convert Template objects to dicts for JSON serialization
+        # Convert Template objects to dicts for JSON serialization and count outcomes in one pass
+        successful_count = failed_count = 0
         for r in results:
             if 'template' in r and r['template'] is not None:
                 r['template'] = template_to_dict(r['template'])
-        
-        # Count successes and failures
-        successful_copies = [r for r in results if r.get('success')]
-        failed_copies = [r for r in results if not r.get('success')]
+            if r.get('success'):
+                successful_count += 1
+            else:
+                failed_count += 1
+                logger.error("Failed to copy template '%s': %s", (r.get('template') or {}).get('row_key'), r.get('error'))
         
         result_summary = {
             'total_templates': len(results),
-            'successful_copies': len(successful_copies),
-            'failed_copies': len(failed_copies),
+            'successful_copies': successful_count,
+            'failed_copies': failed_count,
             'details': results
         }
         
-        if failed_copies:
-            logger.warning(f"Some template copies failed: {len(failed_copies)} failures")
-            for failure in failed_copies:
-                logger.error(f"Failed to copy template '{failure.get('template', {}).get('row_key')}': {failure.get('error')}")
+        if failed_count:
+            logger.warning("Some template copies failed: %s failures", failed_count)
         else:
-            logger.info(f"All {len(successful_copies)} templates copied successfully")
+            logger.info("All %s templates copied successfully", successful_count)
         
         return result_summary
         
     except Exception as e:
-        logger.error(f"Failed to copy template folders: {e}")
+        logger.error("Failed to copy template folders: %s", e)
         return {
             'total_templates': 0,
             'successful_copies': 0,
@@ -465,20 +552,22 @@ def copy_template_folders_skip_existing(
     project_name: str
 ) -> Dict[str, Any]:
     try:
-        logger.info(f"Copying templates for category '{project_category}' (skip existing folders)")
+        logger.info("Copying templates for category '%s' (skip existing folders)", project_category)
         # Get existing folder names in the parent folder
-        existing_folders = folder_manager.list_folder_contents(parent_drive_id, parent_folder_id)
-        existing_names = set()
-        for item in existing_folders.get('value', []):
-            if item.get('folder') is not None:
-                existing_names.add(item.get('name'))
+        existing_folders = folder_manager.list_folder_contents(
+            parent_drive_id, parent_folder_id, select="id,name,folder", folders_only=True
+        )
+        existing_names = {item.get('name') for item in existing_folders.get('value', [])}
         # Copy templates using folder manager, but skip if folder exists
         templates = storage_client.get_templates(project_category)
         results = []
+        pending = []
+        successful_count = skipped_count = failed_count = 0
         for template in templates:
             folder_name = f"{template.row_key} - {project_name}"
             if folder_name in existing_names:
-                logger.info(f"Folder '{folder_name}' already exists, skipping copy.")
+                logger.info("Folder '%s' already exists, skipping copy.", folder_name)
+                skipped_count += 1
                 results.append({
                     'template': template_to_dict(template),
                     'folder_name': folder_name,
@@ -486,42 +575,46 @@ def copy_template_folders_skip_existing(
                     'success': True
                 })
                 continue
-            try:
-                # Use correct source and destination drive IDs
-                result = folder_manager.copy_template(
-                    drive_id=template.drive_id or parent_drive_id,  # source drive
-                    template_id=template.template_folder_id,
-                    parent_id=parent_folder_id,  # destination folder
-                    name=folder_name,
-                    dest_drive_id=parent_drive_id  # destination drive
-                )
+            pending.append((template, folder_name))
+        # Start all remaining copies through Graph $batch rather than one template at a time
+        if pending:
+            copy_results = folder_manager.copy_templates_batch([
+                {
+                    'drive_id': template.drive_id or parent_drive_id,  # source drive
+                    'template_id': template.template_folder_id,
+                    'parent_id': parent_folder_id,  # destination folder
+                    'dest_drive_id': parent_drive_id  # destination drive
+                }
+                for template, _ in pending
+            ])
+            for (template, folder_name), result in zip(pending, copy_results):
+                if isinstance(result, Exception):
+                    logger.error("Failed to copy template '%s': %s", template.row_key, result)
+                    failed_count += 1
+                    results.append({
+                        'template': template_to_dict(template),
+                        'folder_name': folder_name,
+                        'error': str(result),
+                        'success': False
+                    })
+                    continue
                 results.append({
                     'template': template_to_dict(template),
                     'folder_name': folder_name,
                     'result': result,
                     'success': True
                 })
-                logger.info(f"Successfully copied template '{template.row_key}' to '{folder_name}'")
-            except Exception as e:
-                logger.error(f"Failed to copy template '{template.row_key}': {e}")
-                results.append({
-                    'template': template_to_dict(template),
-                    'folder_name': folder_name,
-                    'error': str(e),
-                    'success': False
-                })
-        successful_copies = [r for r in results if r.get('success') and not r.get('skipped')]
-        skipped_copies = [r for r in results if r.get('skipped')]
-        failed_copies = [r for r in results if not r.get('success')]
+                successful_count += 1
+                logger.info("Successfully copied template '%s' to '%s'", template.row_key, folder_name)
         return {
             'total_templates': len(results),
-            'successful_copies': len(successful_copies),
-            'skipped_copies': len(skipped_copies),
-            'failed_copies': len(failed_copies),
+            'successful_copies': successful_count,
+            'skipped_copies': skipped_count,
+            'failed_copies': failed_count,
             'details': results
         }
     except Exception as e:
-        logger.error(f"Failed to copy template folders: {e}")
+        logger.error("Failed to copy template folders: %s", e)
         return {
             'total_templates': 0,
             'successful_copies': 0,
@@ -543,16 +636,22 @@ def resolve_full_graph_site_id(site_id: str, hostname: Optional[str] = None) ->
         return site_id  # Already full format
     if not hostname:
         # Try to get from config
-        from src import config
         hostname = getattr(config, 'SHAREPOINT_HOSTNAME', None) or 'bvcollective.sharepoint.com'
-    # Use Graph API to resolve
-    from src.graph_client import graph_client
-    logger.info(f"Resolving full Graph site ID for GUID: {site_id} and hostname: {hostname}")
+    return _lookup_full_graph_site_id(site_id, hostname)
+
+
+@functools.lru_cache(maxsize=128)
+def _lookup_full_graph_site_id(site_id: str, hostname: str) -> str:
+    """
+    Resolve a site GUID to its full Graph site ID.
+    The mapping is immutable, so results are cached for the lifetime of the process.
+    """
+    logger.info("Resolving full Graph site ID for GUID: %s and hostname: %s", site_id, hostname)
     site_response = graph_client.graph_request("GET", f"/sites/{hostname},{site_id}")
     full_id = site_response.get('id')
     if not full_id:
         raise ValueError(f"Could not resolve full Graph site ID for {site_id}")
-    logger.info(f"Resolved full Graph site ID: {full_id}")
+    logger.info("Resolved full Graph site ID: %s", full_id)
     return full_id
 
 
@@ -569,7 +668,7 @@ def create_project_notebook_and_section_with_metadata(site_id: str, parent_folde
         Dict[str, Any]: Notebook and section creation result
     """
     try:
-        logger.info(f"Creating OneNote notebook/section for project: {notebook_name} in parent folder: {parent_folder_id}")
+        logger.info("Creating OneNote notebook/section for project: %s in parent folder: %s", notebook_name, parent_folder_id)
         # Ensure site_id is the full Graph site ID (resolve if needed)
         full_site_id = resolve_full_graph_site_id(site_id)
         section = onenote_manager.ensure_project_section_with_metadata(full_site_id, parent_folder_id, notebook_name, section_name, smartsheet_data)
@@ -581,9 +680,10 @@ def create_project_notebook_and_section_with_metadata(site_id: str, parent_folde
         
         # Update Smartsheet with the OneNote URL
         try:
-            from src.smartsheet_updater import smartsheet_updater
             row_id = smartsheet_data.get('row_id')
-            sheet_id = int(config.SMTSHEET_ID)
+            sheet_id = _SHEET_ID
+            if sheet_id is None:
+                raise ValueError("SMTSHEET_ID is not configured")
             
             # Get project name from Smartsheet data (for hyperlink display text)
             project_name_for_link = smartsheet_data.get('3534360453271428')  # Project Name column ID
@@ -598,13 +698,13 @@ def create_project_notebook_and_section_with_metadata(site_id: str, parent_folde
                     project_description=project_name_for_link
                 )
                 if success:
-                    logger.info(f"Successfully updated Smartsheet row {row_id} with OneNote URL")
+                    logger.info("Successfully updated Smartsheet row %s with OneNote URL", row_id)
                 else:
-                    logger.warning(f"Failed to update Smartsheet row {row_id} with OneNote URL")
+                    logger.warning("Failed to update Smartsheet row %s with OneNote URL", row_id)
             else:
-                logger.warning(f"Cannot update Smartsheet: missing row_id ({row_id}) or URLs (notebook: {notebook_url}, section: {section_url})")
+                logger.warning("Cannot update Smartsheet: missing row_id (%s) or URLs (notebook: %s, section: %s)", row_id, notebook_url, section_url)
         except Exception as e:
-            logger.error(f"Error updating Smartsheet with OneNote URL: {e}")
+            logger.error("Error updating Smartsheet with OneNote URL: %s", e)
         
         result = {
             'notebook_name': notebook_name,
@@ -613,10 +713,10 @@ def create_project_notebook_and_section_with_metadata(site_id: str, parent_folde
             'section_url': section_url,
             'status': 'success'
         }
-        logger.info(f"Successfully created/verified notebook/section for project '{notebook_name}'")
+        logger.info("Successfully created/verified notebook/section for project '%s'", notebook_name)
         return result
     except Exception as e:
-        logger.error(f"Failed to create project notebook and section: {e}")
+        logger.error("Failed to create project notebook and section: %s", e)
         return {
             'status': 'error',
             'error': str(e)
@@ -633,8 +733,15 @@ def health_check(req: func.HttpRequest) -> func.HttpResponse:
     Returns:
         func.HttpResponse: Health status
     """
+    global _health_probed_at, _health_body
     try:
         logger.info("Health check requested")
+        if _health_body is not None and time.time() - _health_probed_at < _HEALTH_TTL:
+            return func.HttpResponse(
+                body=_health_body,
+                status_code=200,
+                mimetype='application/json'
+            )
         
         # Check configuration
         config_status = "OK" if config.validate() else "FAILED"
@@ -663,16 +770,18 @@ def health_check(req: func.HttpRequest) -> func.HttpResponse:
             }
         }
         
-        logger.info(f"Health check completed: {health_data}")
+        logger.info("Health check completed: %s", health_data)
+        _health_body = _dumps(health_data, indent=True)
+        _health_probed_at = time.time()
         
         return func.HttpResponse(
-            json.dumps(health_data, indent=2),
+            body=_health_body,
             status_code=200,
             mimetype='application/json'
         )
         
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         logger.error(traceback.format_exc())
         
         error_data = {
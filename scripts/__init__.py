@@ -0,0 +1 @@
+# Operational scripts for BVC Smartsheet-SharePoint Automation
@@ -4,18 +4,20 @@ Utility script to set up Azure Table with template mappings.
 This script helps populate the TemplateMapping table with initial data.
 """
 
-import os
+import argparse
+import csv
+import json
 import sys
-from typing import List, Dict, Any
-from dotenv import load_dotenv
+from collections import defaultdict
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import List, Dict, Any, Iterator
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-from storage import storage_client
+from src._env import ensure_loaded
+from src.storage import storage_client, TRANSACTION_MAX_OPERATIONS
 
 # Load environment variables
-load_dotenv()
+ensure_loaded()
 
 
 def get_sample_template_data() -> List[Dict[str, str]]:
@@ -71,6 +73,25 @@ def get_sample_template_data() -> List[Dict[str, str]]:
     ]
 
 
+def chunk_template_data(template_data: List[Dict[str, str]]) -> Iterator[List[Dict[str, str]]]:
+    """
+    Group template data by category and split each group into transaction-sized chunks.
+    
+    Args:
+        template_data: Template dictionaries
+        
+    Yields:
+        List[Dict[str, str]]: Templates sharing a category, at most TRANSACTION_MAX_OPERATIONS long
+    """
+    by_category = itemgetter('category')
+    for _, group in groupby(sorted(template_data, key=by_category), key=by_category):
+        while True:
+            chunk = list(islice(group, TRANSACTION_MAX_OPERATIONS))
+            if not chunk:
+                break
+            yield chunk
+
+
 def setup_template_mapping():
     """Set up the template mapping table with sample data."""
     try:
@@ -89,7 +110,7 @@ def setup_template_mapping():
         print(f"Seeding table with {len(template_data)} template mappings...")
         
         # Seed the table
-        if storage_client.seed_template_data(template_data):
+        if storage_client.seed_template_data_batched(chunk_template_data(template_data)):
             print("✅ Template data seeded successfully")
         else:
             print("❌ Failed to seed template data")
@@ -97,11 +118,12 @@ def setup_template_mapping():
         
         # Verify the data
         print("\nVerifying template data...")
-        categories = storage_client.list_categories()
-        print(f"Found categories: {categories}")
+        templates_by_category = defaultdict(list)
+        for template in storage_client.list_all_templates():
+            templates_by_category[template.partition_key].append(template)
+        print(f"Found categories: {list(templates_by_category)}")
         
-        for category in categories:
-            templates = storage_client.get_templates(category)
+        for category, templates in templates_by_category.items():
             print(f"  {category}: {len(templates)} templates")
             for template in templates:
                 print(f"    - {template.row_key}: {template.template_folder_id}")
@@ -114,6 +136,56 @@ def setup_template_mapping():
         return False
 
 
+def load_template_file(path: str, file_format: str) -> List[Dict[str, str]]:
+    """
+    Load template mappings from a CSV or JSON file.
+    
+    Args:
+        path: File path; CSV needs a header row, JSON holds a list of objects
+        file_format: 'csv' or 'json'
+        
+    Returns:
+        List[Dict[str, str]]: Template data shaped like get_sample_template_data()
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f)) if file_format == 'csv' else json.load(f)
+    
+    templates = []
+    for row in rows:
+        template = {
+            'category': (row.get('category') or '').strip(),
+            'template_name': (row.get('template_name') or '').strip(),
+            'template_folder_id': (row.get('template_folder_id') or '').strip(),
+            'site_id': (row.get('site_id') or '').strip(),
+            'drive_id': (row.get('drive_id') or '').strip()
+        }
+        if not all([template['category'], template['template_name'], template['template_folder_id']]):
+            print(f"⚠️  Skipping incomplete row: {row}")
+            continue
+        templates.append(template)
+    return templates
+
+
+def file_setup(path: str, file_format: str) -> bool:
+    """Seed template mappings from a file without prompting."""
+    try:
+        templates = load_template_file(path, file_format)
+    except (OSError, ValueError) as e:
+        print(f"❌ Failed to read {path}: {e}")
+        return False
+    
+    if not templates:
+        print("No templates to add.")
+        return True
+    
+    print(f"Seeding {len(templates)} templates from {path}...")
+    if storage_client.seed_template_data_batched(chunk_template_data(templates)):
+        print("✅ Templates added successfully!")
+        return True
+    print("❌ Failed to add templates")
+    return False
+
+
 def interactive_setup():
     """Interactive setup for template mappings."""
     print("Interactive Template Mapping Setup")
@@ -156,7 +228,7 @@ def interactive_setup():
     
     if templates:
         print(f"\nSeeding {len(templates)} templates...")
-        if storage_client.seed_template_data(templates):
+        if storage_client.seed_template_data_batched(chunk_template_data(templates)):
             print("✅ Templates added successfully!")
         else:
             print("❌ Failed to add templates")
@@ -166,11 +238,18 @@ def interactive_setup():
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description="Set up Azure Table template mappings")
+    parser.add_argument("--from-file", metavar="PATH",
+                        help="Seed templates from a CSV or JSON file instead of prompting")
+    parser.add_argument("--format", choices=["csv", "json"],
+                        help="File format (defaults to the file extension)")
+    args = parser.parse_args()
+    
     print("BVC Smartsheet-SharePoint Automation - Template Mapping Setup")
     print("=" * 60)
     
     # Check if configuration is valid
-    from config import config
+    from src.config import config
     if not config.validate():
         print("❌ Configuration validation failed. Please check your .env file.")
         print("Required environment variables:")
@@ -179,6 +258,10 @@ def main():
     
     print("Configuration validated successfully!")
     
+    if args.from_file:
+        file_format = args.format or ('json' if args.from_file.lower().endswith('.json') else 'csv')
+        return 0 if file_setup(args.from_file, file_format) else 1
+    
     # Ask user for setup type
     print("\nChoose setup type:")
     print("1. Sample data setup (recommended for testing)")
@@ -0,0 +1,19 @@
+"""
+Process-wide .env loading.
+Every module that needs environment variables from .env calls ensure_loaded()
+so the file is read and parsed once per process.
+"""
+
+import functools
+from dotenv import load_dotenv
+
+
+@functools.cache
+def ensure_loaded() -> bool:
+    """
+    Load the .env file into os.environ on first call; later calls are no-ops.
+    
+    Returns:
+        bool: True if a .env file was found and loaded
+    """
+    return load_dotenv()
@@ -1,18 +1,31 @@
+import io
 import os
+import stat
 import time
 import json
 import logging
-import requests
 import base64
+from typing import Optional, Tuple
 from msal import ConfidentialClientApplication
-from dotenv import load_dotenv, set_key
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from dotenv import set_key
+from dotenv.parser import parse_stream
+try:
+    from ._env import ensure_loaded
+    from .http_session import get_shared_session
+except ImportError:
+    from _env import ensure_loaded
+    from http_session import get_shared_session
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("bvc_bot_auth")
 
 # Load .env
-load_dotenv()
+ensure_loaded()
 ENV_PATH = os.path.join(os.path.dirname(__file__), "..", "..", ".env")
 
 # Environment variables
@@ -26,6 +39,23 @@ TENANT_ID = os.getenv("TENANT_ID")
 AUTHORITY = f"https://login.microsoftonline.com/{TENANT_ID}"
 SCOPE = ["https://graph.microsoft.com/.default", "offline_access"]
 
+# (access_token, exp_unix) for the current token; survives across warm Azure Function invocations
+_TOKEN_STATE: Optional[Tuple[str, int]] = None
+
+# Package-wide keep-alive session for token and Graph calls
+_SESSION = get_shared_session()
+
+# Decoded JWT "exp" claims keyed by token, so each token is only decoded once
+_EXP_CACHE = {}
+_EXP_CACHE_MAX = 8
+
+# orjson parses bytes directly; stdlib json is the fallback when it is not installed
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Request headers for the most recently used token; rebuilt only when the token changes
+_LAST_TOKEN = None
+_LAST_HEADERS = {"Accept": "application/json"}
+
 def save_env_var(key, value):
     """Update a key in the .env file, always writing the value without surrounding single quotes."""
     # Remove any leading/trailing single or double quotes
@@ -33,28 +63,81 @@ def save_env_var(key, value):
         value = value.strip("'\"")
     set_key(ENV_PATH, key, value)
 
+def _quoted_env_line(key, value):
+    """Return a KEY='value' line quoted and escaped the way set_key(quote_mode="always") writes it."""
+    escaped = str(value).replace("\\", "\\\\").replace("'", "\\'")
+    return f"{key}='{escaped}'\n"
+
+def save_env_vars(pairs):
+    """
+    Update several keys in the .env file with one read and one atomic rewrite.
+    
+    Only the lines for the given keys are replaced; every other line, including comments
+    and quoting, is kept verbatim, and the file keeps its permissions.
+    """
+    lines = {}
+    for key, value in pairs.items():
+        if value is None:
+            continue
+        # Remove any leading/trailing single or double quotes
+        lines[key] = _quoted_env_line(key, value.strip("'\"") if isinstance(value, str) else value)
+    if not lines:
+        return
+    source = ""
+    mode = None
+    if os.path.exists(ENV_PATH):
+        with open(ENV_PATH, encoding="utf-8") as env_file:
+            source = env_file.read()
+        mode = stat.S_IMODE(os.stat(ENV_PATH).st_mode)
+    out = []
+    for binding in parse_stream(io.StringIO(source)):
+        line = lines.pop(binding.key, None) if binding.key is not None else None
+        out.append(line if line is not None else binding.original.string)
+    if lines:
+        if out and not out[-1].endswith("\n"):
+            out.append("\n")
+        out.extend(lines.values())
+    tmp_path = f"{ENV_PATH}.tmp"
+    # Created owner-only so secrets are never briefly world-readable, then given the original mode
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as env_file:
+        env_file.writelines(out)
+    if mode is not None:
+        os.chmod(tmp_path, mode)
+    os.replace(tmp_path, ENV_PATH)
+
+def _token_exp(token: str) -> Optional[int]:
+    """Return the JWT "exp" claim of token, or None if it cannot be decoded."""
+    exp = _EXP_CACHE.get(token)
+    if exp is None:
+        try:
+            payload = token.split('.')[1]
+            # Add padding if needed
+            payload += '=' * (-len(payload) % 4)
+            decoded = _json_loads(base64.urlsafe_b64decode(payload))
+            exp = decoded.get("exp")
+            if not exp:
+                return None
+            exp = int(exp)
+        except Exception as e:
+            logger.warning(f"Could not decode token: {e}")
+            return None
+        if len(_EXP_CACHE) >= _EXP_CACHE_MAX:
+            _EXP_CACHE.pop(next(iter(_EXP_CACHE)))
+        _EXP_CACHE[token] = exp
+    return exp
+
 def is_token_valid(token: str) -> bool:
     """Check if the JWT access token is still valid (not expired)."""
     if not token:
         return False
-    try:
-        payload = token.split('.')[1]
-        # Add padding if needed
-        payload += '=' * (-len(payload) % 4)
-        decoded = json.loads(
-            base64.urlsafe_b64decode(payload.encode('utf-8')).decode('utf-8')
-        )
-        exp = decoded.get("exp")
-        if not exp:
-            return False
-        # 2 min safety margin
-        return int(exp) > int(time.time()) + 120
-    except Exception as e:
-        logger.warning(f"Could not decode token: {e}")
-        return False
+    exp = _token_exp(token)
+    # 2 min safety margin
+    return exp is not None and exp > int(time.time()) + 120
 
 def refresh_access_token():
     """Use the refresh token to get a new access token (and refresh token if provided)."""
+    global ACCESS_TOKEN, _TOKEN_STATE
     logger.info("Refreshing access token using refresh token...")
     token_url = f"{AUTHORITY}/oauth2/v2.0/token"
     data = {
@@ -64,27 +147,38 @@ def refresh_access_token():
         "refresh_token": os.getenv("BVC_BOT_REFRESH_TOKEN"),
         "scope": " ".join(SCOPE),
     }
-    resp = requests.post(token_url, data=data)
+    resp = _SESSION.post(token_url, data=data)
     if resp.status_code != 200:
         logger.error(f"Failed to refresh token: {resp.status_code} {resp.text}")
         logger.error("Admin action required: Please re-run the interactive OAuth consent process.")
         return None, None
-    tokens = resp.json()
+    tokens = _json_loads(resp.content)
     access_token = tokens.get("access_token")
     refresh_token = tokens.get("refresh_token")
     if access_token:
-        save_env_var("BVC_BOT_ACCESS_TOKEN", access_token)
-        logger.info("Updated access token in .env")
-    if refresh_token:
-        save_env_var("BVC_BOT_REFRESH_TOKEN", refresh_token)
-        logger.info("Updated refresh token in .env")
+        # Opaque tokens carry no exp claim; fall back to the lifetime the token endpoint reported
+        exp = _token_exp(access_token) or int(time.time()) + int(tokens.get("expires_in", 3600))
+        _TOKEN_STATE = (access_token, exp)
+        ACCESS_TOKEN = access_token
+    if access_token or refresh_token:
+        save_env_vars({
+            "BVC_BOT_ACCESS_TOKEN": access_token,
+            "BVC_BOT_REFRESH_TOKEN": refresh_token
+        })
+        logger.info("Updated tokens in .env")
     return access_token, refresh_token
 
 def get_graph_access_token() -> str:
     """Return a valid access token, refreshing if needed."""
-    token = os.getenv("BVC_BOT_ACCESS_TOKEN")
+    global _TOKEN_STATE
+    state = _TOKEN_STATE
+    if state is not None and state[1] > time.time() + 120:
+        return state[0]
+    # ACCESS_TOKEN is read from the environment once at import and kept current by refreshes
+    token = ACCESS_TOKEN
     if is_token_valid(token):
         logger.info("Using cached access token.")
+        _TOKEN_STATE = (token, _token_exp(token))
         return token
     logger.info("Access token expired or missing, attempting refresh...")
     access_token, _ = refresh_access_token()
@@ -92,25 +186,32 @@ def get_graph_access_token() -> str:
         return access_token
     raise RuntimeError("Could not obtain a valid access token. Admin action required.")
 
+def _auth_headers(token, extra=None):
+    """Return Graph request headers for token, reusing the cached dict while the token is unchanged."""
+    global _LAST_TOKEN, _LAST_HEADERS
+    if token != _LAST_TOKEN:
+        _LAST_HEADERS = {"Accept": "application/json", "Authorization": f"Bearer {token}"}
+        _LAST_TOKEN = token
+    if extra:
+        return {**extra, **_LAST_HEADERS}
+    return _LAST_HEADERS
+
 def graph_api_request(method, url, **kwargs):
     """Make a Microsoft Graph API request with automatic token management."""
     token = get_graph_access_token()
-    headers = kwargs.pop("headers", {})
-    headers["Authorization"] = f"Bearer {token}"
-    headers["Accept"] = "application/json"
-    resp = requests.request(method, url, headers=headers, **kwargs)
+    extra_headers = kwargs.pop("headers", None)
+    resp = _SESSION.request(method, url, headers=_auth_headers(token, extra_headers), **kwargs)
     if resp.status_code == 401:
         logger.warning("Access token rejected, attempting one refresh...")
         # Try one refresh
         token, _ = refresh_access_token()
         if not token:
             raise RuntimeError("Token refresh failed. Admin action required.")
-        headers["Authorization"] = f"Bearer {token}"
-        resp = requests.request(method, url, headers=headers, **kwargs)
+        resp = _SESSION.request(method, url, headers=_auth_headers(token, extra_headers), **kwargs)
     if resp.status_code >= 400:
         logger.error(f"Graph API error: {resp.status_code} {resp.text}")
         resp.raise_for_status()
-    return resp.json()
+    return _json_loads(resp.content)
 
 # Example usage: List SharePoint/OneNote notebooks
 def list_tenant_notebooks():
@@ -121,6 +222,9 @@ if __name__ == "__main__":
     # Test: print the first site returned
     try:
         sites = list_tenant_notebooks()
-        print(json.dumps(sites, indent=2))
+        if orjson is not None:
+            print(orjson.dumps(sites, option=orjson.OPT_INDENT_2).decode())
+        else:
+            print(json.dumps(sites, indent=2))
     except Exception as e:
         logger.error(f"Test failed: {e}") 
\ No newline at end of file
@@ -4,41 +4,72 @@ Loads environment variables and provides centralized configuration.
 """
 
 import os
-from typing import Optional
-from dotenv import load_dotenv
+from typing import Any, Dict
+try:
+    from ._env import ensure_loaded
+except ImportError:
+    from _env import ensure_loaded
 
 # Load environment variables from .env file
-load_dotenv()
+ensure_loaded()
 
 
-class Config:
-    """Centralized configuration class."""
-    
+# Environment-backed settings and their defaults; read from os.environ on access.
+# Integer defaults mark settings whose environment value is parsed as int.
+_ENV_DEFAULTS: Dict[str, Any] = {
     # Azure AD Configuration
-    CLIENT_ID: str = os.getenv("CLIENT_ID", "")
-    CLIENT_SECRET: str = os.getenv("CLIENT_SECRET", "")
-    TENANT_ID: str = os.getenv("TENANT_ID", "")
+    "CLIENT_ID": "",
+    "CLIENT_SECRET": "",
+    "TENANT_ID": "",
     
     # Smartsheet Configuration
-    SMTSHEET_TOKEN: str = os.getenv("SMTSHEET_TOKEN", "")
-    SMTSHEET_ID: str = os.getenv("SMTSHEET_ID", "")
+    "SMTSHEET_TOKEN": "",
+    "SMTSHEET_ID": "",
     
     # Azure Storage Configuration
-    STORAGE_CONNECTION_STRING: str = os.getenv("STORAGE_CONNECTION_STRING", "")
+    "STORAGE_CONNECTION_STRING": "",
     
     # SharePoint Configuration
-    SHAREPOINT_SITE_ID: str = os.getenv("SHAREPOINT_SITE_ID", "")
-    SHAREPOINT_USERNAME: str = os.getenv("SHAREPOINT_USERNAME", "")
-    SHAREPOINT_PASSWORD: str = os.getenv("SHAREPOINT_PASSWORD", "")
+    "SHAREPOINT_SITE_ID": "",
+    "SHAREPOINT_USERNAME": "",
+    "SHAREPOINT_PASSWORD": "",
     
     # Bot Authentication for OneNote (Delegated Auth)
-    BVC_ONENOTE_INGEST_BOT_ID: str = os.getenv("BVC_ONENOTE_INGEST_BOT_ID", "")
-    BVC_ONENOTE_INGEST_BOT_KEY: str = os.getenv("BVC_ONENOTE_INGEST_BOT_KEY", "")
-    BVC_BOT_REFRESH_TOKEN: str = os.getenv("BVC_BOT_REFRESH_TOKEN", "")
-    BVC_BOT_CLIENT_SECRET: str = os.getenv("BVC_BOT_CLIENT_SECRET", "")
+    "BVC_ONENOTE_INGEST_BOT_ID": "",
+    "BVC_ONENOTE_INGEST_BOT_KEY": "",
+    "BVC_BOT_REFRESH_TOKEN": "",
+    "BVC_BOT_CLIENT_SECRET": "",
     
     # Azure Function Configuration
-    FUNCTION_KEY: Optional[str] = os.getenv("FUNCTION_KEY")
+    "FUNCTION_KEY": None,
+    "TOKEN_CACHE_PATH": "",  # MSAL token cache file; empty keeps tokens in memory only
+    
+    # Concurrency Configuration
+    "COPY_CONCURRENCY": 8,  # parallel child copies per template
+}
+
+_REQUIRED = (
+    "BVC_ONENOTE_INGEST_BOT_ID",
+    "BVC_ONENOTE_INGEST_BOT_KEY",
+    "BVC_BOT_REFRESH_TOKEN",
+    "BVC_BOT_CLIENT_SECRET",
+    "SMTSHEET_TOKEN"
+)
+
+
+class Config:
+    """Centralized configuration class."""
+    
+    def __getattr__(self, name: str) -> Any:
+        """Resolve environment-backed settings lazily, only when they are read."""
+        try:
+            default = _ENV_DEFAULTS[name]
+        except KeyError:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+        value = os.environ.get(name)
+        if value is None:
+            return default
+        return int(value) if isinstance(default, int) else value
     
     # Graph API Configuration
     GRAPH_API_SCOPE: str = "https://graph.microsoft.com/.default"
@@ -58,26 +89,14 @@ class Config:
     REQUEST_TIMEOUT: int = 30  # seconds
     COPY_OPERATION_TIMEOUT: int = 300  # seconds
     
-    @classmethod
-    def validate(cls) -> bool:
+    def validate(self) -> bool:
         """
         Validate that all required configuration is present.
         
         Returns:
             bool: True if all required config is present, False otherwise
         """
-        required_fields = [
-            "BVC_ONENOTE_INGEST_BOT_ID",
-            "BVC_ONENOTE_INGEST_BOT_KEY",
-            "BVC_BOT_REFRESH_TOKEN",
-            "BVC_BOT_CLIENT_SECRET",
-            "SMTSHEET_TOKEN"
-        ]
-        
-        missing_fields = []
-        for field in required_fields:
-            if not getattr(cls, field):
-                missing_fields.append(field)
+        missing_fields = [field for field in _REQUIRED if not getattr(self, field)]
         
         if missing_fields:
             print(f"Missing required configuration: {', '.join(missing_fields)}")
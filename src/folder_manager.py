@@ -4,22 +4,100 @@ Handles parsing folder links and copying template folders.
 """
 
 import re
+import base64
 import logging
 import time
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Tuple, Dict, Any, List, Optional
 from urllib.parse import urlparse, parse_qs, unquote
-from .graph_client import graph_client
+from .config import config
+from .graph_client import graph_client, submit_in_context
 from .storage import storage_client, Template
 
 logger = logging.getLogger(__name__)
 
+# Link-parsing patterns, compiled once
+_GRAPH_RE = re.compile(r'/drives/([^/]+)/items/([^/?]+)')
+_SITE_RE = re.compile(r'/sites/([^/]+)(?:/(.*))?$')
+
+# (site_id, folder_path) -> (resolved_at, folder_id); folder identity rarely changes mid-workflow
+_FOLDER_ID_TTL = 300  # seconds
+_folder_id_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+# Full folder URL -> (timestamp, (drive_id, folder_id)) from the /shares lookup
+_shared_item_cache: Dict[str, Tuple[float, Tuple[str, str]]] = {}
+
+# Per-instance folder read caches; listings are short-lived since copies and creates mutate them
+_INFO_CACHE_TTL = 60  # seconds
+_CONTENTS_CACHE_TTL = 10  # seconds
+_FOLDER_CACHE_MAX = 256
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_site_and_drive(hostname: str, site_name: str) -> Tuple[str, str]:
+    """
+    Resolve a SharePoint site and its default drive via Graph.
+    
+    Args:
+        hostname: SharePoint hostname (e.g. 'bvcollective.sharepoint.com')
+        site_name: Site name from the /sites/{name} path segment
+        
+    Returns:
+        Tuple[str, str]: (site_id, drive_id)
+        
+    Raises:
+        ValueError: If the site or its default drive cannot be resolved
+    """
+    site_identifier = f"{hostname}:/sites/{site_name}"
+    logger.info(f"Looking up site ID with identifier: {site_identifier}")
+    site_response = graph_client.graph_request("GET", f"/sites/{site_identifier}")
+    site_id = site_response.get('id')
+    if not site_id:
+        raise ValueError(f"Could not get site ID for {site_identifier}")
+    logger.info(f"Resolved site_id: {site_id}")
+    # Get default drive for the site
+    drive_response = graph_client.graph_request("GET", f"/sites/{site_id}/drive")
+    drive_id = drive_response.get('id')
+    if not drive_id:
+        raise ValueError(f"Could not get default drive for site {site_id}")
+    logger.info(f"Resolved drive_id: {drive_id}")
+    return site_id, drive_id
+
 
 class FolderManager:
     """Manages SharePoint folder operations."""
     
     def __init__(self):
         """Initialize the folder manager."""
-        pass
+        self._info_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._contents_cache: Dict[Tuple[Any, ...], Tuple[float, Dict[str, Any]]] = {}
+    
+    @staticmethod
+    def _cache_get(cache: Dict[Any, Tuple[float, Any]], key: Any, ttl: float) -> Optional[Any]:
+        """Return the cached value for key if it is younger than ttl seconds."""
+        cached = cache.get(key)
+        if cached and time.time() - cached[0] < ttl:
+            return cached[1]
+        return None
+    
+    @staticmethod
+    def _cache_put(cache: Dict[Any, Tuple[float, Any]], key: Any, value: Any) -> None:
+        """Store value under key, evicting the oldest entry once the cache is full."""
+        if key not in cache and len(cache) >= _FOLDER_CACHE_MAX:
+            cache.pop(next(iter(cache)))
+        cache[key] = (time.time(), value)
+    
+    def invalidate_folder(self, drive_id: str, folder_id: str) -> None:
+        """
+        Drop cached info and listings for a folder after its contents change.
+        
+        Args:
+            drive_id: SharePoint drive ID
+            folder_id: Folder ID
+        """
+        self._info_cache.pop((drive_id, folder_id), None)
+        for key in [k for k in self._contents_cache if k[:2] == (drive_id, folder_id)]:
+            self._contents_cache.pop(key, None)
     
     def parse_folder_link(self, url: str) -> Tuple[str, str]:
         """
@@ -47,62 +125,86 @@ class FolderManager:
             logger.error(f"Failed to parse folder link '{url}': {e}")
             raise ValueError(f"Failed to parse folder link: {e}")
     
+    def _resolve_shared_item(self, url: str) -> Optional[Tuple[str, str]]:
+        """
+        Resolve a SharePoint folder URL to (driveId, folderId) with one /shares lookup.
+        
+        Args:
+            url: SharePoint folder URL
+            
+        Returns:
+            Optional[Tuple[str, str]]: (driveId, folderId), or None if Graph cannot resolve the URL as a share
+        """
+        cached = _shared_item_cache.get(url)
+        if cached and time.time() - cached[0] < _FOLDER_ID_TTL:
+            return cached[1]
+        sharing_token = "u!" + base64.urlsafe_b64encode(url.encode('utf-8')).decode('ascii').rstrip('=')
+        try:
+            item = graph_client.graph_request(
+                "GET", f"/shares/{sharing_token}/driveItem",
+                params={"$select": "id,parentReference"}
+            )
+        except Exception as e:
+            response = getattr(e.__cause__, 'response', None)
+            if response is not None and response.status_code in (400, 403, 404):
+                logger.info(f"Shares lookup unavailable ({response.status_code}), falling back to path lookup")
+                return None
+            raise
+        drive_id = item.get('parentReference', {}).get('driveId')
+        folder_id = item.get('id')
+        if not drive_id or not folder_id:
+            return None
+        _shared_item_cache[url] = (time.time(), (drive_id, folder_id))
+        return (drive_id, folder_id)
+    
     def _parse_sharepoint_url(self, url: str) -> Tuple[str, str]:
         """
         Parse a SharePoint URL to extract drive and folder IDs using robust Graph API lookups.
         """
         try:
+            # One round trip when Graph can resolve the URL as a share; otherwise site -> drive -> path
+            resolved = self._resolve_shared_item(url)
+            if resolved:
+                logger.info(f"Resolved SharePoint folder via shares - Drive: {resolved[0]}, Folder: {resolved[1]}")
+                return resolved
             parsed = urlparse(url)
-            path_parts = parsed.path.split('/')
             hostname = parsed.hostname  # e.g., 'bvcollective.sharepoint.com'
-            # Find the site name
-            site_index = -1
-            for i, part in enumerate(path_parts):
-                if part == 'sites':
-                    site_index = i
-                    break
-            if site_index == -1:
+            # Pull the site name and the path after it in one pass
+            site_match = _SITE_RE.search(parsed.path)
+            if not site_match:
                 raise ValueError("Could not find 'sites' in SharePoint URL")
-            site_name = path_parts[site_index + 1]
+            site_name = site_match.group(1)
             logger.info(f"Extracted site_name: {site_name}")
             logger.info(f"Extracted hostname: {hostname}")
-            # Get site ID from Graph API
-            site_identifier = f"{hostname}:/sites/{site_name}"
-            logger.info(f"Looking up site ID with identifier: {site_identifier}")
-            site_response = graph_client.graph_request("GET", f"/sites/{site_identifier}")
-            site_id = site_response.get('id')
-            if not site_id:
-                raise ValueError(f"Could not get site ID for {site_identifier}")
-            logger.info(f"Resolved site_id: {site_id}")
-            # Get default drive for the site
-            drive_response = graph_client.graph_request("GET", f"/sites/{site_id}/drive")
-            drive_id = drive_response.get('id')
-            if not drive_id:
-                raise ValueError(f"Could not get default drive for site {site_id}")
-            logger.info(f"Resolved drive_id: {drive_id}")
+            # Site and default drive are stable per process, so resolve them once
+            site_id, drive_id = _resolve_site_and_drive(hostname, site_name)
             # Extract the server-relative folder path from the URL
             query_params = parse_qs(parsed.query)
             folder_path = query_params.get('id', [None])[0]
             if not folder_path:
                 # If no ?id= param, extract the path after /sites/{siteName}/
                 # e.g., /sites/Opportunities/Shared Documents/General/LED Studio/Convention Center - Tree
-                after_site = parsed.path.split(f"/sites/{site_name}/", 1)
-                if len(after_site) == 2:
-                    folder_path = after_site[1]
-                else:
+                folder_path = site_match.group(2)
+                if folder_path is None:
                     raise ValueError("Could not extract folder path from URL")
                 # Decode percent-encoded characters
                 folder_path = unquote(folder_path)
             logger.info(f"Initial extracted folder_path: {folder_path}")
             folder_path = folder_path.lstrip('/')
             logger.info(f"Relative folder_path for drive: {folder_path}")
-            # Use Graph API to get the folder item by path
-            api_url = f"/sites/{site_id}/drive/root:/{folder_path}"
-            logger.info(f"Graph API folder lookup URL: {api_url}")
-            folder_response = graph_client.graph_request("GET", api_url)
-            folder_id = folder_response.get('id')
-            if not folder_id:
-                raise ValueError(f"Could not find folder: {folder_path}")
+            cache_key = (site_id, folder_path)
+            cached = _folder_id_cache.get(cache_key)
+            if cached and time.time() - cached[0] < _FOLDER_ID_TTL:
+                folder_id = cached[1]
+            else:
+                # Use Graph API to get the folder item by path
+                api_url = f"/sites/{site_id}/drive/root:/{folder_path}"
+                logger.info(f"Graph API folder lookup URL: {api_url}")
+                folder_response = graph_client.graph_request("GET", api_url)
+                folder_id = folder_response.get('id')
+                if not folder_id:
+                    raise ValueError(f"Could not find folder: {folder_path}")
+                _folder_id_cache[cache_key] = (time.time(), folder_id)
             logger.info(f"Successfully resolved SharePoint folder - Drive: {drive_id}, Folder: {folder_id}")
             return (drive_id, folder_id)
         except Exception as e:
@@ -122,8 +224,7 @@ class FolderManager:
         # Example Graph URL:
         # https://graph.microsoft.com/v1.0/drives/{driveId}/items/{itemId}
         
-        pattern = r'/drives/([^/]+)/items/([^/?]+)'
-        match = re.search(pattern, url)
+        match = _GRAPH_RE.search(url)
         
         if not match:
             raise ValueError("Could not extract drive and item IDs from Graph URL")
@@ -154,45 +255,29 @@ class FolderManager:
             Dict[str, Any]: Copy operation result
         """
         try:
-            # List children of the template folder
-            children = graph_client.get_drive_items(drive_id, template_id).get('value', [])
-            if not children:
+            parent_reference = {
+                "driveId": dest_drive_id,
+                "id": parent_id
+            }
+            # Copies and their completion polling are independent, so overlap them; children
+            # are streamed page by page so copies start while later pages are still listed
+            results = []
+            with ThreadPoolExecutor(max_workers=max(1, config.COPY_CONCURRENCY)) as executor:
+                futures = [
+                    submit_in_context(executor, self._copy_one_child, drive_id, child, parent_reference)
+                    for child in graph_client.iter_drive_items(drive_id, template_id, select="id,name")
+                ]
+                for future in as_completed(futures):
+                    results.append(future.result())
+            self.invalidate_folder(dest_drive_id, parent_id)
+            if not futures:
                 logger.warning(f"No children found in template folder {template_id}")
                 return {'success': False, 'error': 'No children in template folder'}
-            results = []
-            for child in children:
-                child_id = child['id']
-                child_name = child['name']
-                parent_reference = {
-                    "driveId": dest_drive_id,
-                    "id": parent_id
-                }
-                logger.info(f"Copying child item {child_id} ({child_name}) to destination folder {parent_id}")
-                try:
-                    copy_response = graph_client.copy_item(
-                        drive_id=drive_id,  # source drive
-                        item_id=child_id,
-                        parent_reference=parent_reference,
-                        name=child_name
-                    )
-                    # Wait for completion if needed
-                    if 'Location' in copy_response:
-                        location_url = copy_response['Location']
-                        logger.info(f"Copy operation for {child_name} initiated, monitoring at: {location_url}")
-                        result = graph_client.wait_for_copy_completion(location_url)
-                        logger.info(f"Copy operation for {child_name} completed: {result}")
-                        results.append({'child': child_name, 'result': result, 'success': True})
-                    else:
-                        logger.info(f"Copy operation for {child_name} completed immediately: {copy_response}")
-                        results.append({'child': child_name, 'result': copy_response, 'success': True})
-                except Exception as e:
-                    logger.error(f"Failed to copy child {child_name}: {e}")
-                    results.append({'child': child_name, 'error': str(e), 'success': False})
             # Summarize
             successful = [r for r in results if r['success']]
             failed = [r for r in results if not r['success']]
             return {
-                'total_children': len(children),
+                'total_children': len(futures),
                 'successful_copies': len(successful),
                 'failed_copies': len(failed),
                 'details': results
@@ -201,6 +286,134 @@ class FolderManager:
             logger.error(f"Failed to copy children from template {template_id}: {e}")
             raise
     
+    def _copy_one_child(self, drive_id: str, child: Dict[str, Any], parent_reference: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Copy a single template child and wait for the copy to finish.
+        
+        Args:
+            drive_id: Source SharePoint drive ID
+            child: Child drive item from the template folder
+            parent_reference: Destination parent reference
+            
+        Returns:
+            Dict[str, Any]: Per-child result with 'child', 'success' and 'result' or 'error'
+        """
+        child_id = child['id']
+        child_name = child['name']
+        logger.info(f"Copying child item {child_id} ({child_name}) to destination folder {parent_reference['id']}")
+        try:
+            # Throttled copies (429/503) are resent by the pooled session, honouring Retry-After
+            copy_response = graph_client.copy_item(
+                drive_id=drive_id,  # source drive
+                item_id=child_id,
+                parent_reference=parent_reference,
+                name=child_name
+            )
+            # Wait for completion if needed
+            if 'Location' in copy_response:
+                location_url = copy_response['Location']
+                logger.info(f"Copy operation for {child_name} initiated, monitoring at: {location_url}")
+                result = graph_client.wait_for_copy_completion(location_url)
+                logger.info(f"Copy operation for {child_name} completed: {result}")
+                return {'child': child_name, 'result': result, 'success': True}
+            logger.info(f"Copy operation for {child_name} completed immediately: {copy_response}")
+            return {'child': child_name, 'result': copy_response, 'success': True}
+        except Exception as e:
+            logger.error(f"Failed to copy child {child_name}: {e}")
+            return {'child': child_name, 'error': str(e), 'success': False}
+    
+    def copy_templates_batch(self, jobs: List[Dict[str, str]]) -> List[Any]:
+        """
+        Copy the children of several template folders using Graph JSON batching.
+        Listing template children and starting the child copies each take
+        ceil(N/20) round trips instead of one request per item.
+        
+        Args:
+            jobs: One dict per template with 'drive_id' (source drive), 'template_id',
+                  'parent_id' (destination folder) and 'dest_drive_id'
+                  
+        Returns:
+            List[Any]: One entry per job, in order: a result dict shaped like
+            copy_template's, or the Exception that prevented the copy
+        """
+        results: List[Any] = [None] * len(jobs)
+        # Phase 1: list the children of every template folder in one batch
+        listings = graph_client.graph_batch([
+            {
+                "id": str(i),
+                "method": "GET",
+                "url": f"/drives/{job['drive_id']}/items/{job['template_id']}/children"
+            }
+            for i, job in enumerate(jobs)
+        ])
+        copy_requests = []
+        children_by_request: Dict[str, Tuple[int, str]] = {}
+        children_count: Dict[int, int] = {}
+        for i, job in enumerate(jobs):
+            listing = listings.get(str(i), {})
+            if listing.get('status', 500) >= 400:
+                error = listing.get('body', {}).get('error', {}).get('message', 'Unknown error')
+                logger.error(f"Failed to list children of template {job['template_id']}: {error}")
+                results[i] = Exception(f"Failed to list template children: {error}")
+                continue
+            children = listing.get('body', {}).get('value', [])
+            if not children:
+                logger.warning(f"No children found in template folder {job['template_id']}")
+                results[i] = {'success': False, 'error': 'No children in template folder'}
+                continue
+            children_count[i] = len(children)
+            for child in children:
+                request_id = f"{i}-{len(copy_requests)}"
+                children_by_request[request_id] = (i, child['name'])
+                copy_requests.append({
+                    "id": request_id,
+                    "method": "POST",
+                    "url": f"/drives/{job['drive_id']}/items/{child['id']}/copy",
+                    "body": {
+                        "parentReference": {
+                            "driveId": job['dest_drive_id'],
+                            "id": job['parent_id']
+                        },
+                        "name": child['name']
+                    }
+                })
+        # Phase 2: start every child copy in batches, then wait on the monitors
+        copy_responses = graph_client.graph_batch(copy_requests) if copy_requests else {}
+        details: Dict[int, List[Dict[str, Any]]] = {i: [] for i in children_count}
+        for request_id, (i, child_name) in children_by_request.items():
+            response = copy_responses.get(request_id, {})
+            status = response.get('status', 500)
+            try:
+                if status >= 400:
+                    error = response.get('body', {}).get('error', {}).get('message', 'Unknown error')
+                    raise Exception(f"Copy request failed with status {status}: {error}")
+                location_url = response.get('headers', {}).get('Location')
+                if location_url:
+                    logger.info(f"Copy operation for {child_name} initiated, monitoring at: {location_url}")
+                    result = graph_client.wait_for_copy_completion(location_url)
+                    logger.info(f"Copy operation for {child_name} completed: {result}")
+                else:
+                    result = response.get('body', {})
+                    logger.info(f"Copy operation for {child_name} completed immediately: {result}")
+                details[i].append({'child': child_name, 'result': result, 'success': True})
+            except Exception as e:
+                logger.error(f"Failed to copy child {child_name}: {e}")
+                details[i].append({'child': child_name, 'error': str(e), 'success': False})
+        for i, child_results in details.items():
+            successful = sum(1 for r in child_results if r['success'])
+            results[i] = {
+                'total_children': children_count[i],
+                'successful_copies': successful,
+                'failed_copies': len(child_results) - successful,
+                'details': child_results
+            }
+        # The batched copies land in folders their request paths do not name, so evict the
+        # destination listings that graph_batch and this manager left cached
+        for dest_drive_id, parent_id in {(jobs[i]['dest_drive_id'], jobs[i]['parent_id']) for i in children_count}:
+            graph_client.invalidate(f"/drives/{dest_drive_id}/items/{parent_id}")
+            self.invalidate_folder(dest_drive_id, parent_id)
+        return results
+    
     def copy_templates_for_category(
         self, 
         parent_drive_id: str, 
@@ -224,42 +437,69 @@ class FolderManager:
             if not templates:
                 logger.warning(f"No templates found for category '{project_category}'")
                 return []
-            results = []
-            for template in templates:
-                try:
-                    # Each template has its own drive_id (source) from the TemplateMapping table
-                    source_drive_id = template.drive_id or parent_drive_id
-                    template_id = template.template_folder_id
-                    folder_name = f"{template.row_key} - {project_name}"
-                    logger.info(f"Copying template '{template.row_key}' from drive {source_drive_id} to drive {parent_drive_id}")
-                    # Copy the template from source_drive_id/template_id to parent_drive_id/parent_folder_id
-                    result = self.copy_template(
-                        drive_id=source_drive_id,  # source
-                        template_id=template_id,
-                        parent_id=parent_folder_id,  # destination folder
-                        name=folder_name,
-                        dest_drive_id=parent_drive_id  # destination drive
+            # Templates copy independently, so overlap them; wall time tracks the slowest one
+            max_workers = max(1, min(config.COPY_CONCURRENCY, len(templates)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    submit_in_context(
+                        executor, self._copy_category_template,
+                        template, parent_drive_id, parent_folder_id, project_name
                     )
-                    results.append({
-                        'template': template,
-                        'folder_name': folder_name,
-                        'result': result,
-                        'success': True
-                    })
-                    logger.info(f"Successfully copied template '{template.row_key}' to '{folder_name}'")
-                except Exception as e:
-                    logger.error(f"Failed to copy template '{template.row_key}': {e}")
-                    results.append({
-                        'template': template,
-                        'folder_name': folder_name,
-                        'error': str(e),
-                        'success': False
-                    })
-            return results
+                    for template in templates
+                ]
+                return [future.result() for future in futures]
         except Exception as e:
             logger.error(f"Failed to copy templates for category '{project_category}': {e}")
             raise
     
+    def _copy_category_template(
+        self,
+        template: Template,
+        parent_drive_id: str,
+        parent_folder_id: str,
+        project_name: str
+    ) -> Dict[str, Any]:
+        """
+        Copy one category template, mapping any exception to a failure result.
+        
+        Args:
+            template: Template to copy
+            parent_drive_id: Destination SharePoint drive ID (project)
+            parent_folder_id: Destination parent folder ID (project)
+            project_name: Project name
+            
+        Returns:
+            Dict[str, Any]: Copy operation result for the template
+        """
+        folder_name = f"{template.row_key} - {project_name}"
+        try:
+            # Each template has its own drive_id (source) from the TemplateMapping table
+            source_drive_id = template.drive_id or parent_drive_id
+            logger.info(f"Copying template '{template.row_key}' from drive {source_drive_id} to drive {parent_drive_id}")
+            # Copy the template from source_drive_id/template_id to parent_drive_id/parent_folder_id
+            result = self.copy_template(
+                drive_id=source_drive_id,  # source
+                template_id=template.template_folder_id,
+                parent_id=parent_folder_id,  # destination folder
+                name=folder_name,
+                dest_drive_id=parent_drive_id  # destination drive
+            )
+            logger.info(f"Successfully copied template '{template.row_key}' to '{folder_name}'")
+            return {
+                'template': template,
+                'folder_name': folder_name,
+                'result': result,
+                'success': True
+            }
+        except Exception as e:
+            logger.error(f"Failed to copy template '{template.row_key}': {e}")
+            return {
+                'template': template,
+                'folder_name': folder_name,
+                'error': str(e),
+                'success': False
+            }
+    
     def get_folder_info(self, drive_id: str, folder_id: str) -> Dict[str, Any]:
         """
         Get information about a SharePoint folder.
@@ -271,26 +511,55 @@ class FolderManager:
         Returns:
             Dict[str, Any]: Folder information
         """
+        key = (drive_id, folder_id)
+        cached = self._cache_get(self._info_cache, key, _INFO_CACHE_TTL)
+        if cached is not None:
+            return cached
         try:
             endpoint = f"/drives/{drive_id}/items/{folder_id}"
-            return graph_client.graph_request("GET", endpoint)
+            info = graph_client.graph_request("GET", endpoint)
+            self._cache_put(self._info_cache, key, info)
+            return info
         except Exception as e:
             logger.error(f"Failed to get folder info for {folder_id}: {e}")
             raise
     
-    def list_folder_contents(self, drive_id: str, folder_id: str) -> Dict[str, Any]:
+    def list_folder_contents(
+        self, 
+        drive_id: str, 
+        folder_id: str,
+        select: Optional[str] = None,
+        folders_only: bool = False
+    ) -> Dict[str, Any]:
         """
         List contents of a SharePoint folder.
         
         Args:
             drive_id: SharePoint drive ID
             folder_id: Folder ID
+            select: Optional $select projection (e.g. "id,name,folder") to shrink the response
+            folders_only: Only return child folders
             
         Returns:
             Dict[str, Any]: Folder contents
         """
+        key = (drive_id, folder_id, select, folders_only)
+        cached = self._cache_get(self._contents_cache, key, _CONTENTS_CACHE_TTL)
+        if cached is not None:
+            return cached
         try:
-            return graph_client.get_drive_items(drive_id, folder_id)
+            if select is None and not folders_only:
+                contents = graph_client.get_drive_items(drive_id, folder_id)
+                self._cache_put(self._contents_cache, key, contents)
+                return contents
+            
+            items = graph_client.iter_drive_items(drive_id, folder_id, select=select)
+            if folders_only:
+                items = (item for item in items if item.get('folder') is not None)
+            items = list(items)
+            contents = {'value': items}
+            self._cache_put(self._contents_cache, key, contents)
+            return contents
         except Exception as e:
             logger.error(f"Failed to list folder contents for {folder_id}: {e}")
             raise
@@ -316,7 +585,9 @@ class FolderManager:
             }
             
             logger.info(f"Creating folder '{folder_name}' in parent {parent_id}")
-            return graph_client.graph_request("POST", endpoint, data=data)
+            created = graph_client.graph_request("POST", endpoint, data=data)
+            self.invalidate_folder(drive_id, parent_id)
+            return created
             
         except Exception as e:
             logger.error(f"Failed to create folder '{folder_name}': {e}")
@@ -335,7 +606,9 @@ class FolderManager:
         """
         try:
             # List all items in the parent folder
-            items = graph_client.get_drive_items(drive_id, parent_folder_id)
+            items = graph_client.get_drive_items(
+                drive_id, parent_folder_id, select="id,name,folder,webUrl"
+            )
             
             for item in items.get('value', []):
                 if item.get('folder') is not None:  # It's a folder
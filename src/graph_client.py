@@ -3,93 +3,385 @@ Microsoft Graph API client with MSAL authentication.
 Handles both app-only and delegated authentication for SharePoint and OneNote operations.
 """
 
+import os
 import json
+import atexit
 import time
 import logging
 import base64
-from typing import Dict, Any, Optional, Tuple
+import random
+import threading
+import contextvars
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, Tuple, List, Iterator, Callable
 import requests
 import msal
 import tenacity
+try:
+    import orjson
+except ImportError:
+    orjson = None
 try:
     from .config import config
+    from .http_session import get_shared_session
 except ImportError:
     from config import config
+    from http_session import get_shared_session
 
 logger = logging.getLogger(__name__)
 
+# orjson parses bytes directly; stdlib json is the fallback when it is not installed
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+# Root of all Graph v1.0 endpoints; nextLink URLs are absolute under it
+GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
+
+# Copy monitor polling: exponential backoff from COPY_POLL_INITIAL_DELAY, capped at COPY_POLL_MAX_DELAY
+COPY_POLL_INITIAL_DELAY = 0.25  # seconds
+COPY_POLL_MAX_DELAY = 5.0  # seconds
+
+# In-process cache of GET responses, shared by app-only and delegated reads
+GET_CACHE_TTL = 60  # seconds
+GET_CACHE_MAX_ENTRIES = 1024
+
+# Worker threads for fanning out independent Graph calls; stays below the session pool size
+GRAPH_WORKERS = 8
+
+# Largest page size Graph accepts for drive item listings
+DRIVE_ITEMS_PAGE_SIZE = 999
+
+# Maximum number of sub-requests Graph accepts in a single $batch call
+BATCH_MAX_REQUESTS = 20
+
+# Sub-response statuses that are resent in a follow-up batch. A 504 write may already have
+# been applied, so only GET sub-requests are resent on 504; writes use THROTTLE_RETRY_STATUSES.
+BATCH_RETRY_STATUSES = frozenset({429, 503, 504})
+
+# Statuses where Graph did not act on the request, so a resent write cannot duplicate.
+# Direct requests are retried on these by the pooled session (http_session.ThrottleAwareRetry).
+THROTTLE_RETRY_STATUSES = frozenset({429, 503})
+
+# Scopes requested when redeeming the bot refresh token
+DELEGATED_REFRESH_SCOPES: Tuple[str, ...] = (
+    "https://graph.microsoft.com/User.Read",
+    "https://graph.microsoft.com/Notes.ReadWrite.All"
+)
+
+
+def _error_response(e: BaseException) -> Optional[requests.Response]:
+    """
+    Return the HTTP response behind a requests error, including one wrapped by graph_request.
+    
+    Args:
+        e: Raised exception
+        
+    Returns:
+        Optional[requests.Response]: Failed response, or None if there was no response
+    """
+    for err in (e, e.__cause__):
+        if isinstance(err, requests.exceptions.RequestException) and err.response is not None:
+            return err.response
+    return None
+
+
+def _error_status(e: BaseException) -> Optional[int]:
+    """
+    Return the HTTP status behind a requests error, including one wrapped by graph_request.
+    
+    Args:
+        e: Raised exception
+        
+    Returns:
+        Optional[int]: Response status code, or None if there was no response
+    """
+    response = _error_response(e)
+    return response.status_code if response is not None else None
+
+
+def _is_403(e: BaseException) -> bool:
+    """Return whether e is (or wraps) a Graph 403 response."""
+    return _error_status(e) == 403
+
+
+# Correlation id sent as client-request-id. A context variable rather than a thread-local so
+# work handed to pools through submit_in_context keeps the invocation's id.
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("graph_request_id", default=None)
+
+
+def submit_in_context(executor: Executor, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """
+    Submit fn to executor so it runs in a copy of the caller's context.
+    
+    Use this instead of executor.submit for work that makes Graph calls, so worker threads
+    send the same client-request-id as the submitting thread.
+    
+    Returns:
+        Future: Future for fn's result
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def _log_error_response(e: requests.exceptions.RequestException) -> None:
+    """Log the status of a failed response; the body is only read when debug logging is on."""
+    response = e.response
+    if response is None:
+        return
+    logger.error("Response status: %s", response.status_code)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Response body: %s", response.text)
+
 
 class GraphClient:
     """Microsoft Graph API client with MSAL authentication."""
     
-    def __init__(self):
-        """Initialize the Graph client with MSAL configuration."""
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Initialize the Graph client with MSAL configuration.
+        
+        Args:
+            session: HTTP session to use; defaults to the package-wide pooled session
+        """
         self.authority = f"https://login.microsoftonline.com/{config.TENANT_ID}"
         self.scope = [config.get_graph_api_scope()]
         self.delegated_scope = [config.GRAPH_API_DELEGATED_SCOPE]
+        # MSAL token cache shared by both flows; persisted when TOKEN_CACHE_PATH is set so
+        # tokens survive process restarts
+        self._msal_cache = msal.SerializableTokenCache()
+        self._token_cache_path = config.TOKEN_CACHE_PATH
+        self._token_cache_file_lock = threading.Lock()
+        if self._token_cache_path:
+            self._load_token_cache()
+            atexit.register(self._save_token_cache)
+        # Pooled HTTP session so Graph and token-endpoint calls reuse keep-alive TCP/TLS connections
+        self.session = session or get_shared_session()
         # App-only (client credentials) flow
         self.app = msal.ConfidentialClientApplication(
             client_id=config.CLIENT_ID,
             client_credential=config.CLIENT_SECRET,
-            authority=self.authority
+            authority=self.authority,
+            token_cache=self._msal_cache,
+            http_client=self.session
         )
         # Delegated (user) flow: Public client, no secret
         self.public_app = msal.PublicClientApplication(
             client_id=config.BVC_ONENOTE_INGEST_BOT_ID,
-            authority=self.authority
+            authority=self.authority,
+            token_cache=self._msal_cache,
+            http_client=self.session
         )
         self._access_token = None
         self._token_expires_at = 0
         self._delegated_token = None
         self._delegated_token_expires_at = 0
+        # Token writes happen under _state_lock; fast-path reads stay lock-free
+        self._state_lock = threading.Lock()
+        # Decoded JWT "exp" claims keyed by token; tokens are immutable for their lifetime
+        self._exp_cache: Dict[str, float] = {}
+        # In-flight delegated refreshes keyed by scopes, so concurrent callers coalesce
+        self._refresh_inflight: Dict[Tuple[str, ...], Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Only one token acquisition per flow at a time; refresh tokens rotate on redemption
+        self._token_lock = threading.Lock()
+        self._delegated_lock = threading.RLock()
+        # Latest rotated refresh token; takes precedence over the configured one
+        self._refresh_token: Optional[str] = None
+        # (flow, endpoint, params) -> (timestamp, response) for repeated identical GETs
+        self._get_cache: Dict[Tuple[Any, ...], Tuple[float, Dict[str, Any]]] = {}
+        self._get_cache_lock = threading.Lock()
+        # Base request headers keyed by bearer token; callers must not mutate them
+        self._header_cache: Dict[str, Dict[str, str]] = {}
+        # Shared pool for bulk helpers; threads are only started on first use
+        self._executor = ThreadPoolExecutor(max_workers=GRAPH_WORKERS, thread_name_prefix="graph")
+    
+    def _base_headers(self, token: str) -> Dict[str, str]:
+        """Return the shared Authorization/Content-Type headers for token, building them once per token."""
+        base = self._header_cache.get(token)
+        if base is None:
+            # Only the current app-only and delegated tokens are live; drop rotated ones
+            if len(self._header_cache) >= 4:
+                self._header_cache.clear()
+            base = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+            self._header_cache[token] = base
+        return base
+    
+    def _get_cache_key(self, flow: str, endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+        """Build the GET cache key for a request."""
+        return (flow, endpoint, frozenset(params.items()) if params else None)
+    
+    def _get_cached(self, key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        """Return a cached GET response if it is younger than GET_CACHE_TTL."""
+        cached = self._get_cache.get(key)
+        if cached and time.time() - cached[0] < GET_CACHE_TTL:
+            return cached[1]
+        return None
+    
+    def _store_cached(self, key: Tuple[Any, ...], value: Dict[str, Any]) -> None:
+        """Store a GET response, evicting the oldest entry once the cache is full."""
+        with self._get_cache_lock:
+            if key not in self._get_cache and len(self._get_cache) >= GET_CACHE_MAX_ENTRIES:
+                self._get_cache.pop(next(iter(self._get_cache)), None)
+            self._get_cache[key] = (time.time(), value)
+    
+    def invalidate(self, endpoint_prefix: str = "") -> None:
+        """
+        Drop cached GET responses whose endpoint starts with endpoint_prefix.
+        
+        Args:
+            endpoint_prefix: Graph endpoint prefix (e.g. '/sites/{siteId}/onenote'); empty clears everything
+        """
+        with self._get_cache_lock:
+            for key in [k for k in self._get_cache if k[1].startswith(endpoint_prefix)]:
+                self._get_cache.pop(key, None)
+    
+    def _invalidate_for_write(self, method: str, endpoint: str) -> None:
+        """Evict cached reads a successful write may have changed."""
+        path = endpoint.split('?', 1)[0]
+        if method != "POST":
+            # PATCH/PUT/DELETE target an item; its parent collection listing changes too
+            path = path.rsplit('/', 1)[0]
+        self.invalidate(path)
+    
+    def _load_token_cache(self) -> None:
+        """Load the persisted MSAL token cache, ignoring a missing or unreadable file."""
+        try:
+            with open(self._token_cache_path, "r") as cache_file:
+                self._msal_cache.deserialize(cache_file.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load token cache from {self._token_cache_path}: {e}")
+    
+    def _save_token_cache(self) -> None:
+        """Persist the MSAL token cache if it changed, with an atomic rewrite."""
+        if not self._token_cache_path or not self._msal_cache.has_state_changed:
+            return
+        with self._token_cache_file_lock:
+            try:
+                tmp_path = f"{self._token_cache_path}.tmp"
+                with open(tmp_path, "w") as cache_file:
+                    cache_file.write(self._msal_cache.serialize())
+                os.replace(tmp_path, self._token_cache_path)
+                self._msal_cache.has_state_changed = False
+            except Exception as e:
+                logger.warning(f"Could not save token cache to {self._token_cache_path}: {e}")
+    
+    def _set_app_token(self, token: str, expires_at: float) -> None:
+        """Publish a new app-only token; expiry is zeroed first so lock-free readers never pair it with the old token."""
+        with self._state_lock:
+            self._token_expires_at = 0
+            self._access_token = token
+            self._token_expires_at = expires_at
+    
+    def _set_delegated_token(self, token: str, expires_at: float) -> None:
+        """Publish a new delegated token; same write ordering as _set_app_token."""
+        with self._state_lock:
+            self._delegated_token_expires_at = 0
+            self._delegated_token = token
+            self._delegated_token_expires_at = expires_at
+    
+    def set_request_id(self, request_id: Optional[str]) -> None:
+        """
+        Set the correlation id sent as client-request-id on Graph calls in the current context,
+        including work this context later hands to pools through submit_in_context.
+        
+        Args:
+            request_id: GUID to send, or None to stop sending one
+        """
+        _request_id.set(request_id)
+    
+    def close(self) -> None:
+        """Shut down the bulk worker pool and close pooled connections held by the HTTP session."""
+        self._executor.shutdown(wait=False)
+        self.session.close()
     
     def is_token_valid(self, token: str) -> bool:
         """Check if the JWT access token is still valid (not expired)."""
         if not token:
             return False
-        try:
-            payload = token.split('.')[1]
-            # Add padding if needed
-            payload += '=' * (-len(payload) % 4)
-            decoded = json.loads(
-                base64.urlsafe_b64decode(payload.encode('utf-8')).decode('utf-8')
-            )
-            exp = decoded.get("exp")
-            if not exp:
+        now = time.time()
+        exp = self._exp_cache.get(token)
+        if exp is None:
+            parts = token.split('.', 2)
+            if len(parts) < 2:
                 return False
-            # 2 min safety margin
-            return int(exp) > int(time.time()) + 120
-        except Exception as e:
-            logger.warning(f"Could not decode token: {e}")
-            return False
+            # The payload segment is ASCII; decode straight from bytes, padding as needed
+            payload = parts[1].encode('ascii')
+            payload += b'=' * (-len(payload) % 4)
+            try:
+                exp = _json_loads(base64.urlsafe_b64decode(payload)).get("exp")
+            except Exception as e:
+                logger.warning(f"Could not decode token: {e}")
+                return False
+            if not isinstance(exp, (int, float)):
+                return False
+            # Drop expired tokens so the cache stays bounded by the number of live tokens
+            for stale in [t for t, t_exp in self._exp_cache.items() if t_exp < now]:
+                del self._exp_cache[stale]
+            self._exp_cache[token] = exp
+        # 2 min safety margin
+        return exp > now + 120
     
     def refresh_delegated_token(self) -> str:
-        """Use the refresh token to get a new delegated access token (public client flow)."""
-        logger.info("Refreshing delegated access token using refresh token (public client flow)...")
-        bot_client_id = getattr(config, 'BVC_ONENOTE_INGEST_BOT_ID', None)
-        refresh_token = getattr(config, 'BVC_BOT_REFRESH_TOKEN', None)
-        if not all([bot_client_id, refresh_token]):
-            raise Exception("Missing bot credentials for delegated authentication")
-        # Use public client flow (no secret)
-        result = self.public_app.acquire_token_by_refresh_token(
-            refresh_token,
-            scopes=[
-                "https://graph.microsoft.com/User.Read",
-                "https://graph.microsoft.com/Notes.ReadWrite.All"
-            ]
-        )
-        if "access_token" not in result:
-            logger.error(f"Failed to refresh delegated token: {result}")
-            raise Exception(f"Failed to refresh delegated token: {result}")
-        access_token = result["access_token"]
-        new_refresh_token = result.get("refresh_token")
-        if access_token:
-            self._delegated_token = access_token
-            self._delegated_token_expires_at = time.time() + result.get("expires_in", 3600) - 300
-            logger.info("Successfully refreshed delegated access token")
-        if new_refresh_token:
-            logger.info("New refresh token received (update your .env if you want to persist it)")
-        return access_token
+        """
+        Use the refresh token to get a new delegated access token (public client flow).
+        Concurrent callers for the same scopes share a single in-flight refresh.
+        """
+        scopes = DELEGATED_REFRESH_SCOPES
+        with self._inflight_lock:
+            future = self._refresh_inflight.get(scopes)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._refresh_inflight[scopes] = future
+        if not is_owner:
+            logger.info("Delegated token refresh already in flight, waiting for its result")
+            return future.result()
+        try:
+            access_token = self._acquire_delegated_token(list(scopes))
+            future.set_result(access_token)
+            return access_token
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._refresh_inflight.pop(scopes, None)
+    
+    def _acquire_delegated_token(self, scopes: List[str]) -> str:
+        """Redeem the bot refresh token with MSAL for the given delegated scopes."""
+        with self._delegated_lock:
+            logger.info("Refreshing delegated access token using refresh token (public client flow)...")
+            bot_client_id = getattr(config, 'BVC_ONENOTE_INGEST_BOT_ID', None)
+            refresh_token = self._refresh_token or getattr(config, 'BVC_BOT_REFRESH_TOKEN', None)
+            if not all([bot_client_id, refresh_token]):
+                raise Exception("Missing bot credentials for delegated authentication")
+            # Use public client flow (no secret)
+            result = self.public_app.acquire_token_by_refresh_token(
+                refresh_token,
+                scopes=scopes
+            )
+            if "access_token" not in result:
+                logger.error(f"Failed to refresh delegated token: {result}")
+                raise Exception(f"Failed to refresh delegated token: {result}")
+            access_token = result["access_token"]
+            new_refresh_token = result.get("refresh_token")
+            if access_token:
+                self._set_delegated_token(access_token, time.time() + result.get("expires_in", 3600) - 300)
+                logger.info("Successfully refreshed delegated access token")
+            if new_refresh_token and new_refresh_token != refresh_token:
+                # Persist the rotated token before releasing the lock so the next redemption uses it
+                self._refresh_token = new_refresh_token
+                os.environ["BVC_BOT_REFRESH_TOKEN"] = new_refresh_token
+                logger.info("Rotated refresh token stored for this process (update your .env to persist it)")
+            self._save_token_cache()
+            return access_token
     
     def get_delegated_access_token(self) -> str:
         """
@@ -101,18 +393,23 @@ class GraphClient:
         Raises:
             Exception: If token acquisition fails
         """
-        # Check if we have a valid delegated token
-        if self._delegated_token and self.is_token_valid(self._delegated_token):
+        # Check if we have a valid delegated token; same float compare as the app-only path
+        if self._delegated_token and time.time() < self._delegated_token_expires_at - 120:
             return self._delegated_token
         
-        # Try to get from config first
-        config_token = getattr(config, 'BVC_BOT_ACCESS_TOKEN', None)
-        if config_token and self.is_token_valid(config_token):
-            self._delegated_token = config_token
-            return config_token
-        
-        # Refresh the token
-        return self.refresh_delegated_token()
+        with self._delegated_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self._delegated_token and time.time() < self._delegated_token_expires_at - 120:
+                return self._delegated_token
+            
+            # Try to get from config first
+            config_token = getattr(config, 'BVC_BOT_ACCESS_TOKEN', None)
+            if config_token and self.is_token_valid(config_token):
+                self._set_delegated_token(config_token, self._exp_cache[config_token])
+                return config_token
+            
+            # Refresh under the lock already held; refresh_delegated_token would wait on its own in-flight map
+            return self._acquire_delegated_token(list(DELEGATED_REFRESH_SCOPES))
     
     def get_access_token(self) -> str:
         """
@@ -128,24 +425,32 @@ class GraphClient:
         if self._access_token and time.time() < self._token_expires_at:
             return self._access_token
         
-        # Acquire new token
-        result = self.app.acquire_token_for_client(scopes=self.scope)
-        
-        if result is None or "access_token" not in result:
-            error_msg = f"Failed to acquire token: {result.get('error_description', 'Unknown error') if result else 'No result'}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
-        
-        self._access_token = result["access_token"]
-        # Set expiration time with 5-minute buffer
-        expires_in = result.get("expires_in", 3600)
-        if isinstance(expires_in, (int, float)):
-            self._token_expires_at = time.time() + expires_in - 300
-        else:
-            self._token_expires_at = time.time() + 3600 - 300
-        
-        logger.info("Successfully acquired new access token")
-        return self._access_token
+        with self._token_lock:
+            # Another thread may have acquired a token while we waited for the lock
+            if self._access_token and time.time() < self._token_expires_at:
+                return self._access_token
+            
+            # A still-valid token may already be in the (possibly persisted) MSAL cache
+            result = self.app.acquire_token_silent(self.scope, account=None)
+            if not isinstance(result, dict) or "access_token" not in result:
+                # Acquire new token
+                result = self.app.acquire_token_for_client(scopes=self.scope)
+                self._save_token_cache()
+            
+            if result is None or "access_token" not in result:
+                error_msg = f"Failed to acquire token: {result.get('error_description', 'Unknown error') if result else 'No result'}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
+            
+            # Set expiration time with 5-minute buffer
+            expires_in = result.get("expires_in", 3600)
+            if not isinstance(expires_in, (int, float)):
+                expires_in = 3600
+            access_token = result["access_token"]
+            self._set_app_token(access_token, time.time() + expires_in - 300)
+            
+            logger.info("Successfully acquired new access token")
+            return access_token
     
     def graph_request(
         self, 
@@ -153,7 +458,8 @@ class GraphClient:
         endpoint: str, 
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        no_cache: bool = False
     ) -> Dict[str, Any]:
         """
         Make a request to the Microsoft Graph API.
@@ -164,6 +470,7 @@ class GraphClient:
             data: Request body data
             params: Query parameters
             headers: Additional headers
+            no_cache: Bypass the in-process GET cache
             
         Returns:
             Dict[str, Any]: Response data
@@ -171,25 +478,32 @@ class GraphClient:
         Raises:
             Exception: If request fails
         """
-        url = f"https://graph.microsoft.com/v1.0{endpoint}"
+        cache_key = None
+        if method == "GET" and not no_cache:
+            cache_key = self._get_cache_key("app", endpoint, params)
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return cached
+        
+        url = f"{GRAPH_BASE_URL}{endpoint}"
         
         # Get access token
         access_token = self.get_access_token()
         
-        # Prepare headers
-        request_headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
+        # Prepare headers; the per-token base dict is shared and only copied when extended
+        request_headers = self._base_headers(access_token)
+        request_id = _request_id.get()
+        if request_id:
+            request_headers = {**request_headers, "client-request-id": request_id}
         if headers:
-            request_headers.update(headers)
+            request_headers = {**request_headers, **headers}
         
         # Make request
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
-                json=data,
+                data=_json_dumps(data) if data is not None else None,
                 params=params,
                 headers=request_headers,
                 timeout=config.REQUEST_TIMEOUT
@@ -199,20 +513,24 @@ class GraphClient:
             
             # Handle empty or non-JSON responses
             if response.status_code in (202, 204) or not response.content:
-                return {}
-            
-            try:
-                return response.json()
-            except Exception:
-                logger.warning(f"Non-JSON response from Graph API for {url}: {response.text}")
-                return {"raw_response": response.text}
+                result = {}
+            else:
+                try:
+                    result = _json_loads(response.content)
+                except Exception:
+                    logger.warning(f"Non-JSON response from Graph API for {url}: {response.text}")
+                    return {"raw_response": response.text}
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Graph API request failed: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response status: {e.response.status_code}")
-                logger.error(f"Response body: {e.response.text}")
-            raise Exception(f"Graph API request failed: {e}")
+            logger.error("Graph API request failed: %s", e)
+            _log_error_response(e)
+            raise Exception(f"Graph API request failed: {e}") from e
+        
+        if cache_key is not None:
+            self._store_cached(cache_key, result)
+        elif method != "GET":
+            self._invalidate_for_write(method, endpoint)
+        return result
     
     def graph_request_delegated(
         self, 
@@ -222,7 +540,8 @@ class GraphClient:
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
         username: Optional[str] = None,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        no_cache: bool = False
     ) -> Dict[str, Any]:
         """
         Make a delegated request to the Microsoft Graph API.
@@ -235,6 +554,7 @@ class GraphClient:
             headers: Additional headers
             username: User email (optional)
             password: User password (optional)
+            no_cache: Bypass the in-process GET cache
             
         Returns:
             Dict[str, Any]: Response data
@@ -242,25 +562,32 @@ class GraphClient:
         Raises:
             Exception: If request fails
         """
-        url = f"https://graph.microsoft.com/v1.0{endpoint}"
+        cache_key = None
+        if method == "GET" and not no_cache:
+            cache_key = self._get_cache_key("delegated", endpoint, params)
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return cached
+        
+        url = f"{GRAPH_BASE_URL}{endpoint}"
         
         # Get delegated access token
         access_token = self.get_delegated_access_token()
         
-        # Prepare headers
-        request_headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
+        # Prepare headers; the per-token base dict is shared and only copied when extended
+        request_headers = self._base_headers(access_token)
+        request_id = _request_id.get()
+        if request_id:
+            request_headers = {**request_headers, "client-request-id": request_id}
         if headers:
-            request_headers.update(headers)
+            request_headers = {**request_headers, **headers}
         
         # Make request
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
-                json=data,
+                data=_json_dumps(data) if data is not None else None,
                 params=params,
                 headers=request_headers,
                 timeout=config.REQUEST_TIMEOUT
@@ -269,17 +596,78 @@ class GraphClient:
             response.raise_for_status()
             
             # Handle empty responses
-            if response.status_code == 204:  # No Content
-                return {}
-            
-            return response.json()
+            result = {} if response.status_code == 204 else _json_loads(response.content)  # 204: No Content
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Delegated Graph API request failed: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response status: {e.response.status_code}")
-                logger.error(f"Response body: {e.response.text}")
-            raise Exception(f"Delegated Graph API request failed: {e}")
+            logger.error("Delegated Graph API request failed: %s", e)
+            _log_error_response(e)
+            raise Exception(f"Delegated Graph API request failed: {e}") from e
+        
+        if cache_key is not None:
+            self._store_cached(cache_key, result)
+        elif method != "GET":
+            self._invalidate_for_write(method, endpoint)
+        return result
+    
+    def graph_batch(
+        self,
+        batch_requests: List[Dict[str, Any]],
+        delegated: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Send several Graph requests through the JSON batching endpoint.
+        Requests are split into chunks of BATCH_MAX_REQUESTS (the Graph limit). Sub-requests
+        throttled with 429/503 (and GETs that timed out with 504) are resent, honouring their
+        Retry-After, up to MAX_RETRIES times.
+        
+        Args:
+            batch_requests: Sub-requests with 'id', 'method', 'url' (relative to /v1.0)
+                            and optional 'body'/'headers'
+            delegated: Send the batch with the delegated (bot) token instead of app-only
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Sub-responses keyed by request id, each with
+            'status', 'headers' and 'body'
+        """
+        request_fn = self.graph_request_delegated if delegated else self.graph_request
+        responses: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for sub_request in batch_requests:
+            if 'body' in sub_request and 'headers' not in sub_request:
+                sub_request = {**sub_request, 'headers': {"Content-Type": "application/json"}}
+            pending.append(sub_request)
+        
+        for attempt in range(config.MAX_RETRIES + 1):
+            retry = []
+            retry_after = 0
+            for start in range(0, len(pending), BATCH_MAX_REQUESTS):
+                chunk = pending[start:start + BATCH_MAX_REQUESTS]
+                logger.info(f"Sending Graph batch with {len(chunk)} requests")
+                result = request_fn("POST", "/$batch", data={"requests": chunk})
+                by_id = {sub_request['id']: sub_request for sub_request in chunk}
+                for sub_response in result.get('responses', []):
+                    sub_id = sub_response.get('id')
+                    responses[sub_id] = sub_response
+                    sub_request = by_id.get(sub_id)
+                    if sub_request is None:
+                        continue
+                    method = sub_request.get('method', 'GET').upper()
+                    retry_statuses = BATCH_RETRY_STATUSES if method == "GET" else THROTTLE_RETRY_STATUSES
+                    if sub_response.get('status') in retry_statuses:
+                        retry.append(sub_request)
+                        hint = (sub_response.get('headers') or {}).get('Retry-After', '')
+                        if isinstance(hint, str) and hint.isdigit():
+                            retry_after = max(retry_after, int(hint))
+                    elif method != "GET":
+                        # Includes a 504, which may have been applied even though it timed out
+                        self._invalidate_for_write(method, sub_request['url'])
+            if not retry or attempt == config.MAX_RETRIES:
+                break
+            delay = retry_after or config.RETRY_DELAY
+            logger.warning(f"{len(retry)} batch sub-requests throttled, retrying in {delay}s")
+            time.sleep(delay)
+            pending = retry
+        return responses
     
     def copy_item(
         self, 
@@ -307,7 +695,10 @@ class GraphClient:
         }
         
         logger.info(f"Copying item {item_id} to {name}")
-        return self.graph_request("POST", endpoint, data=data)
+        result = self.graph_request("POST", endpoint, data=data)
+        # The copy lands in the destination folder, which the request path does not name
+        self.invalidate(f"/drives/{parent_reference.get('driveId', drive_id)}/items/{parent_reference.get('id')}")
+        return result
     
     def get_copy_status(self, location_url: str) -> Dict[str, Any]:
         """
@@ -320,24 +711,29 @@ class GraphClient:
             Dict[str, Any]: Status response
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 location_url,
                 timeout=config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 202:
-                # Still in progress
-                return {"status": "inProgress"}
+                # Still in progress; surface the monitor's own polling hint when it gives one
+                status = {"status": "inProgress"}
+                retry_after = response.headers.get("Retry-After")
+                if isinstance(retry_after, str) and retry_after.isdigit():
+                    status["retryAfter"] = int(retry_after)
+                return status
             elif response.status_code == 200:
                 # Completed
-                return response.json()
+                return _json_loads(response.content)
             else:
                 response.raise_for_status()
                 return {"status": "unknown"}
                 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to check copy status: {e}")
-            raise Exception(f"Failed to check copy status: {e}")
+            logger.error("Failed to check copy status: %s", e)
+            _log_error_response(e)
+            raise Exception(f"Failed to check copy status: {e}") from e
     
     def wait_for_copy_completion(self, location_url: str, timeout: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -356,28 +752,41 @@ class GraphClient:
         if timeout is None:
             timeout = config.COPY_OPERATION_TIMEOUT
         
-        start_time = time.time()
+        deadline = time.time() + timeout
+        delay = COPY_POLL_INITIAL_DELAY
         
-        while time.time() - start_time < timeout:
+        while time.time() < deadline:
             status = self.get_copy_status(location_url)
             
-            if status.get("status") != "inProgress":
+            if status.get("status") not in ("inProgress", "notStarted"):
                 if "error" in status:
                     raise Exception(f"Copy operation failed: {status['error']}")
                 return status
             
-            # Wait before checking again
-            time.sleep(5)
+            # Honour Retry-After when the monitor sends one; otherwise back off exponentially
+            # with jitter so concurrent pollers spread out
+            if status.get("retryAfter") is not None:
+                sleep_for = float(status["retryAfter"])
+            else:
+                sleep_for = min(delay, COPY_POLL_MAX_DELAY) * (0.5 + random.random())
+            time.sleep(max(0.0, min(sleep_for, deadline - time.time())))
+            delay *= 2
         
         raise Exception(f"Copy operation timed out after {timeout} seconds")
     
-    def get_drive_items(self, drive_id: str, folder_id: Optional[str] = None) -> Dict[str, Any]:
+    def get_drive_items(
+        self,
+        drive_id: str,
+        folder_id: Optional[str] = None,
+        select: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Get items in a SharePoint drive or folder.
         
         Args:
             drive_id: SharePoint drive ID
             folder_id: Optional folder ID to list items from
+            select: Optional $select projection (e.g. "id,name,folder") to shrink the response
             
         Returns:
             Dict[str, Any]: Items response
@@ -387,8 +796,67 @@ class GraphClient:
         else:
             endpoint = f"/drives/{drive_id}/root/children"
         
+        if select:
+            return self.graph_request("GET", endpoint, params={"$select": select})
         return self.graph_request("GET", endpoint)
     
+    def iter_drive_items(
+        self,
+        drive_id: str,
+        folder_id: Optional[str] = None,
+        select: Optional[str] = None,
+        top: int = DRIVE_ITEMS_PAGE_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield items in a SharePoint drive or folder, fetching pages as they are consumed.
+        
+        Args:
+            drive_id: SharePoint drive ID
+            folder_id: Optional folder ID to list items from
+            select: Optional $select projection applied to every page
+            top: Page size; the Graph maximum keeps the number of round trips down
+            
+        Yields:
+            Dict[str, Any]: Drive items, following @odata.nextLink across pages
+        """
+        if folder_id:
+            endpoint = f"/drives/{drive_id}/items/{folder_id}/children"
+        else:
+            endpoint = f"/drives/{drive_id}/root/children"
+        
+        params: Dict[str, Any] = {"$top": top}
+        if select:
+            params["$select"] = select
+        return self.stream_items(endpoint, params=params)
+    
+    def stream_items(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        delegated: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the 'value' items of a paged Graph collection, one page at a time.
+        Later pages are only fetched if the caller keeps iterating, so a lookup that
+        stops at its first match skips the rest of the collection.
+        
+        Args:
+            endpoint: Graph API collection endpoint
+            params: Query parameters for the first page
+            delegated: Use the delegated (bot) token instead of app-only
+            
+        Yields:
+            Dict[str, Any]: Collection items, following @odata.nextLink across pages
+        """
+        request_fn = self.graph_request_delegated if delegated else self.graph_request
+        while endpoint:
+            page = request_fn("GET", endpoint, params=params)
+            yield from page.get('value', [])
+            next_link = page.get('@odata.nextLink')
+            endpoint = next_link[len(GRAPH_BASE_URL):] if next_link else None
+            # nextLink already carries the query string
+            params = None
+    
     def get_site_notebooks(self, site_id: str, display_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Get OneNote notebooks for a SharePoint site using delegated authentication.
@@ -404,20 +872,58 @@ class GraphClient:
         params = {}
         
         if display_name:
-            params["$filter"] = f"displayName eq '{display_name}'"
+            # Name lookups only need the match's identity and links
+            escaped_name = display_name.replace("'", "''")
+            params["$filter"] = f"displayName eq '{escaped_name}'"
+            params["$select"] = "id,displayName,links"
+            params["$top"] = 1
         
         return self.graph_request_delegated("GET", endpoint, params=params)
     
-    def create_notebook(self, site_id: str, display_name: str) -> Dict[str, Any]:
+    def get_site_notebook_with_sections(self, site_id: str, display_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a site notebook by display name with its sections expanded, in one round trip.
+
+        If the tenant rejects the $expand (HTTP 400), the notebook is looked up without it
+        and the returned dict has no 'sections' key.
+
+        Args:
+            site_id: SharePoint site ID
+            display_name: Notebook display name
+
+        Returns:
+            Optional[Dict[str, Any]]: The notebook, or None if there is none with that name
+        """
+        endpoint = f"/sites/{site_id}/onenote/notebooks"
+        escaped_name = display_name.replace("'", "''")
+        params = {
+            "$filter": f"displayName eq '{escaped_name}'",
+            "$expand": "sections($select=id,displayName,links)",
+            "$top": 1
+        }
+        try:
+            notebooks = self.graph_request_delegated("GET", endpoint, params=params).get('value', [])
+        except Exception as e:
+            if _error_status(e) != 400:
+                raise
+            logger.warning(f"$expand=sections rejected for site {site_id}; looking up notebook without it")
+            del params["$expand"]
+            notebooks = self.graph_request_delegated("GET", endpoint, params=params).get('value', [])
+        return notebooks[0] if notebooks else None
+    
+    def create_notebook(self, site_id: str, display_name: str, existing_on_conflict: bool = False) -> Optional[Dict[str, Any]]:
         """
         Create a new OneNote notebook using delegated authentication.
         
         Args:
             site_id: SharePoint site ID
             display_name: Notebook display name
+            existing_on_conflict: On 409, return the notebook that already has this name
+                instead of raising
             
         Returns:
-            Dict[str, Any]: Created notebook response
+            Optional[Dict[str, Any]]: Created notebook response, or the conflicting notebook
+            (None if it could not be read back) when existing_on_conflict is set
         """
         endpoint = f"/sites/{site_id}/onenote/notebooks"
         data = {
@@ -425,7 +931,33 @@ class GraphClient:
         }
         
         logger.info(f"Creating OneNote notebook with delegated auth: {display_name}")
-        return self.graph_request_delegated("POST", endpoint, data=data)
+        try:
+            return self.graph_request_delegated("POST", endpoint, data=data)
+        except Exception as e:
+            if not existing_on_conflict or _error_status(e) != 409:
+                raise
+            logger.warning(f"409 Conflict: notebook '{display_name}' already exists in site {site_id}")
+            return self._get_conflicting_notebook(site_id, display_name, _error_response(e))
+    
+    def _get_conflicting_notebook(self, site_id: str, display_name: str, response: requests.Response) -> Optional[Dict[str, Any]]:
+        """
+        Read back the notebook a create collided with.
+        
+        Follows a Location/Content-Location header on the 409 when Graph sends one; otherwise
+        looks the single notebook up by name rather than listing the site's notebooks.
+        
+        Args:
+            site_id: SharePoint site ID
+            display_name: Notebook display name
+            response: The 409 response
+            
+        Returns:
+            Optional[Dict[str, Any]]: The existing notebook, or None if it was not found
+        """
+        location = response.headers.get('Location') or response.headers.get('Content-Location')
+        if isinstance(location, str) and location.startswith(GRAPH_BASE_URL):
+            return self.graph_request_delegated("GET", location[len(GRAPH_BASE_URL):], no_cache=True)
+        return self.get_site_notebook_with_sections(site_id, display_name)
     
     def create_notebook_section(
         self, 
@@ -466,7 +998,11 @@ class GraphClient:
         params = {}
         
         if display_name:
-            params["$filter"] = f"displayName eq '{display_name}'"
+            # Name lookups only need the match's identity and links
+            escaped_name = display_name.replace("'", "''")
+            params["$filter"] = f"displayName eq '{escaped_name}'"
+            params["$select"] = "id,displayName,links"
+            params["$top"] = 1
         
         return self.graph_request_delegated("GET", endpoint, params=params)
     
@@ -538,26 +1074,82 @@ class GraphClient:
         endpoint = f"/sites/{site_id}/onenote/notebooks/{notebook_id}/sections"
         return self.graph_request_delegated("GET", endpoint)
 
-    def get_site_notebook_section_pages(self, site_id: str, section_id: str) -> Dict[str, Any]:
+    def find_section_by_name(self, site_id: Optional[str], notebook_id: str, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a single notebook section by display name with a server-side filter.
+
+        Args:
+            site_id: SharePoint site ID, or None for the signed-in user's notebooks
+            notebook_id: Notebook ID
+            name: Section display name
+
+        Returns:
+            Optional[Dict[str, Any]]: The matching section, or None if there is none
+        """
+        root = f"/sites/{site_id}" if site_id else "/me"
+        endpoint = f"{root}/onenote/notebooks/{notebook_id}/sections"
+        escaped_name = name.replace("'", "''")
+        params = {
+            "$filter": f"displayName eq '{escaped_name}'",
+            "$select": "id,displayName,links",
+            "$top": 1
+        }
+        sections = self.graph_request_delegated("GET", endpoint, params=params).get('value', [])
+        return sections[0] if sections else None
+
+    def get_sections_for_notebooks(self, site_id: str, notebook_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the sections of several site notebooks with one batched round trip.
+        
+        Args:
+            site_id: SharePoint site ID
+            notebook_ids: Notebook IDs
+            
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Sections keyed by notebook ID; notebooks whose
+            lookup failed are omitted
+        """
+        batch_requests = [
+            {
+                'id': str(index),
+                'method': 'GET',
+                'url': f"/sites/{site_id}/onenote/notebooks/{notebook_id}/sections"
+            }
+            for index, notebook_id in enumerate(notebook_ids)
+        ]
+        responses = self.graph_batch(batch_requests, delegated=True)
+        sections: Dict[str, List[Dict[str, Any]]] = {}
+        for index, notebook_id in enumerate(notebook_ids):
+            sub_response = responses.get(str(index), {})
+            if sub_response.get('status') == 200:
+                sections[notebook_id] = sub_response.get('body', {}).get('value', [])
+            else:
+                logger.warning(f"Failed to get sections for notebook {notebook_id}: {sub_response.get('status')}")
+        return sections
+
+    def get_site_notebook_section_pages(self, site_id: str, section_id: str, title: Optional[str] = None) -> Dict[str, Any]:
         """
         Get pages in a OneNote section in a SharePoint site using delegated authentication.
         
         Args:
             site_id: SharePoint site ID
             section_id: Section ID
+            title: Optional filter by page title
             
         Returns:
             Dict[str, Any]: Pages response
         """
         endpoint = f"/sites/{site_id}/onenote/sections/{section_id}/pages"
-        return self.graph_request_delegated("GET", endpoint)
+        params = {}
+        
+        if title:
+            escaped_title = title.replace("'", "''")
+            params["$filter"] = f"title eq '{escaped_title}'"
+            params["$select"] = "id,title,links"
+            params["$top"] = 1
+        
+        return self.graph_request_delegated("GET", endpoint, params=params)
 
-    @tenacity.retry(
-        reraise=True,
-        stop=tenacity.stop_after_attempt(config.MAX_RETRIES),
-        wait=tenacity.wait_exponential(multiplier=config.RETRY_DELAY),
-        retry=tenacity.retry_if_exception(lambda e: isinstance(e, requests.exceptions.RequestException) and hasattr(e, 'response') and getattr(e.response, 'status_code', None) == 403)
-    )
     def create_site_notebook_section(
         self, 
         site_id: str, 
@@ -566,14 +1158,52 @@ class GraphClient:
     ) -> Dict[str, Any]:
         """
         Create a new section in a OneNote notebook in a SharePoint site using delegated authentication.
-        Retries on 403 errors with exponential backoff.
+        Retries on 403 errors with exponential backoff; throttling (429/503) is retried by the
+        pooled session, honouring Retry-After.
         """
         endpoint = f"/sites/{site_id}/onenote/notebooks/{notebook_id}/sections"
         data = {
             "displayName": section_name
         }
         logger.info(f"Creating OneNote section in site notebook with delegated auth: {section_name}")
-        return self.graph_request_delegated("POST", endpoint, data=data)
+        # Retry settings are read per call so they track the current config
+        for attempt in tenacity.Retrying(
+            reraise=True,
+            stop=tenacity.stop_after_attempt(config.MAX_RETRIES),
+            wait=tenacity.wait_exponential(multiplier=config.RETRY_DELAY),
+            retry=tenacity.retry_if_exception(_is_403)
+        ):
+            with attempt:
+                return self.graph_request_delegated("POST", endpoint, data=data)
+
+    def create_notebook_sections_bulk(self, site_id: str, notebook_id: str, names: List[str]) -> List[Any]:
+        """
+        Create several sections in a site notebook concurrently.
+        Each creation keeps the 403 retry of create_site_notebook_section; a section that
+        still fails (e.g. throttled with 429) is reported in its result slot.
+        
+        Args:
+            site_id: SharePoint site ID
+            notebook_id: Notebook ID
+            names: Section display names
+            
+        Returns:
+            List[Any]: One entry per name, in order: the created section, or the Exception
+            that prevented its creation
+        """
+        results: List[Any] = [None] * len(names)
+        futures = {
+            submit_in_context(self._executor, self.create_site_notebook_section, site_id, notebook_id, name): index
+            for index, name in enumerate(names)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to create section '{names[index]}' in notebook {notebook_id}: {e}")
+                results[index] = e
+        return results
 
     def get_notebook_by_name_and_parent(self, site_id: str, parent_folder_id: str, notebook_name: str):
         """
@@ -586,17 +1216,22 @@ class GraphClient:
             Dict[str, Any] or None: Notebook metadata if found, else None
         """
         try:
+            # Filter by name server-side and expand sections so the match arrives with its
+            # sections in the same round trip; the parent check stays client-side
             endpoint = f"/sites/{site_id}/onenote/notebooks"
-            response = self.graph_request_delegated("GET", endpoint)
-            notebooks = response.get('value', [])
-            
-            logger.info(f"Searching for notebook '{notebook_name}' in {len(notebooks)} notebooks")
+            escaped_name = notebook_name.replace("'", "''")
+            params = {
+                "$filter": f"displayName eq '{escaped_name}'",
+                "$select": "id,displayName,parentSectionGroupId",
+                "$expand": "sections"
+            }
+            logger.info(f"Searching for notebook '{notebook_name}' in site {site_id}")
             
-            for nb in notebooks:
+            for nb in self.stream_items(endpoint, params=params, delegated=True):
                 nb_name = nb.get('displayName', '')
                 nb_parent = nb.get('parentSectionGroupId', '')
                 
-                logger.debug(f"Checking notebook: '{nb_name}' with parent: '{nb_parent}'")
+                logger.debug("Checking notebook: '%s' with parent: '%s'", nb_name, nb_parent)
                 
                 if nb_name == notebook_name and nb_parent == parent_folder_id:
                     logger.info(f"Found matching notebook: '{notebook_name}' with ID: {nb.get('id')}")
@@ -620,29 +1255,31 @@ class GraphClient:
             }
             response = self.graph_request_delegated("POST", endpoint, data=data)
             return response
-        except requests.exceptions.RequestException as e:
+        except Exception as e:
             # If 409 conflict, fetch the existing notebook
-            if hasattr(e, 'response') and e.response is not None and e.response.status_code == 409:
+            if _error_status(e) == 409:
                 logger.warning(f"Notebook already exists, fetching existing notebook: {notebook_name}")
                 try:
-                    notebooks = self.graph_request_delegated("GET", endpoint)
-                    found = False
-                    for nb in notebooks.get('value', []):
-                        nb_name = nb.get('displayName', '')
-                        nb_parent = nb.get('parentSectionGroupId', '')
-                        logger.debug(f"Checking notebook: '{nb_name}' with parent: '{nb_parent}'")
-                        if nb_name == notebook_name and nb_parent == parent_folder_id:
-                            logger.info(f"Found existing notebook: {notebook_name} with ID: {nb.get('id')}")
-                            found = True
-                            return nb
-                    if not found:
-                        logger.error(f"Notebook exists but could not be found by name: {notebook_name} and parent: {parent_folder_id}")
-                        # Fallback: return the first notebook with matching name
-                        for nb in notebooks.get('value', []):
-                            if nb.get('displayName', '') == notebook_name:
-                                logger.info(f"Fallback: Found notebook by name only: {notebook_name} with ID: {nb.get('id')}")
-                                return nb
-                        raise Exception(f"Notebook exists but could not be found: {notebook_name}")
+                    # Only same-named notebooks come back; index them by parent once for both lookups
+                    escaped_name = notebook_name.replace("'", "''")
+                    params = {
+                        "$filter": f"displayName eq '{escaped_name}'",
+                        "$select": "id,displayName,parentSectionGroupId,links"
+                    }
+                    by_parent: Dict[str, Dict[str, Any]] = {}
+                    for nb in self.stream_items(endpoint, params=params, delegated=True):
+                        by_parent.setdefault(nb.get('parentSectionGroupId', ''), nb)
+                    nb = by_parent.get(parent_folder_id)
+                    if nb is not None:
+                        logger.info(f"Found existing notebook: {notebook_name} with ID: {nb.get('id')}")
+                        return nb
+                    logger.error(f"Notebook exists but could not be found by name: {notebook_name} and parent: {parent_folder_id}")
+                    # Fallback: return the first notebook with matching name
+                    if by_parent:
+                        nb = next(iter(by_parent.values()))
+                        logger.info(f"Fallback: Found notebook by name only: {notebook_name} with ID: {nb.get('id')}")
+                        return nb
+                    raise Exception(f"Notebook exists but could not be found: {notebook_name}")
                 except Exception as fetch_error:
                     logger.error(f"Failed to fetch existing notebook: {fetch_error}")
                     raise
@@ -666,9 +1303,9 @@ class GraphClient:
             }
             response = self.graph_request_delegated("POST", endpoint, data=data)
             return response
-        except requests.exceptions.RequestException as e:
+        except Exception as e:
             # If 409 conflict, fetch the existing notebook in the folder
-            if hasattr(e, 'response') and e.response is not None and e.response.status_code == 409:
+            if _error_status(e) == 409:
                 logger.warning(f"Notebook already exists in folder, fetching existing notebook: {notebook_name}")
                 return self.find_notebook_in_drive_folder(site_id, parent_folder_id, notebook_name)
             logger.error(f"Failed to create notebook in drive folder: {e}")
@@ -686,9 +1323,10 @@ class GraphClient:
         """
         try:
             endpoint = f"/sites/{site_id}/drive/items/{parent_folder_id}/children"
-            response = self.graph_request_delegated("GET", endpoint)
-            for item in response.get('value', []):
-                if item.get('name', '').lower() == notebook_name.lower() and item.get('file', {}).get('mimeType', '').startswith('application/onenote'):
+            params = {"$select": "id,name,file,webUrl,parentReference"}
+            target_name = notebook_name.lower()
+            for item in self.stream_items(endpoint, params=params, delegated=True):
+                if item.get('name', '').lower() == target_name and item.get('file', {}).get('mimeType', '').startswith('application/onenote'):
                     logger.info(f"Found notebook '{notebook_name}' in folder with ID: {item.get('id')}")
                     return item
             logger.info(f"No notebook named '{notebook_name}' found in folder {parent_folder_id}")
@@ -700,6 +1338,7 @@ class GraphClient:
     def create_page_in_section(self, site_id: str, section_id: str, html_content: str) -> dict:
         """
         Create a OneNote page in the specified section with the given HTML content.
+        Throttling (429/503) is retried by the pooled session, honouring Retry-After.
         Args:
             site_id: SharePoint site ID
             section_id: OneNote section ID
@@ -707,8 +1346,7 @@ class GraphClient:
         Returns:
             dict: API response for the created page
         """
-        import requests
-        endpoint = f"https://graph.microsoft.com/v1.0/sites/{site_id}/onenote/sections/{section_id}/pages"
+        endpoint = f"{GRAPH_BASE_URL}/sites/{site_id}/onenote/sections/{section_id}/pages"
         headers = {
             "Authorization": f"Bearer {self.get_delegated_access_token()}"
             # Do NOT set Content-Type here; requests will set it for multipart
@@ -717,9 +1355,12 @@ class GraphClient:
             'Presentation': ('page.html', html_content, 'text/html')
         }
         logger.info(f"Creating OneNote page in section {section_id} (site {site_id}) [multipart/form-data]")
-        response = requests.post(endpoint, headers=headers, files=files)
+        response = self.session.post(
+            endpoint, headers=headers, files=files, timeout=config.REQUEST_TIMEOUT
+        )
         response.raise_for_status()
-        return response.json()
+        self.invalidate(f"/sites/{site_id}/onenote/sections/{section_id}/pages")
+        return _json_loads(response.content)
 
     def share_folder_with_anyone_link(self, drive_id: str, item_id: str) -> Dict[str, Any]:
         """
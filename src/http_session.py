@@ -0,0 +1,73 @@
+"""
+Shared HTTP connection pool.
+Graph, token-endpoint and Smartsheet REST calls all go through one pooled
+requests.Session so keep-alive TCP/TLS connections are reused package-wide.
+Smartsheet SDK calls go through one shared SDK client, which pools its own connections.
+"""
+
+import functools
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Statuses retried for idempotent methods
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Statuses that mean the server did not act on the request, so even POST/PATCH are safe to resend
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class ThrottleAwareRetry(Retry):
+    """Retry policy that also resends non-idempotent requests when they were throttled."""
+    
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        """Return whether a response with status_code should be retried for method."""
+        if self._is_method_retryable(method):
+            return super().is_retry(method, status_code, has_retry_after)
+        # A 500/502/504 on a POST may have created the resource already; throttling did not
+        return bool(self.total) and status_code in THROTTLE_STATUSES
+
+
+@functools.cache
+def get_shared_session() -> requests.Session:
+    """
+    Return the process-wide pooled session, creating it on first use.
+    
+    Returns:
+        requests.Session: Session with a 32-connection HTTPS pool and transient-error retries
+        that honour Retry-After
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=ThrottleAwareRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+    ))
+    return session
+
+
+@functools.cache
+def get_smartsheet_client(token: str):
+    """
+    Return the process-wide Smartsheet SDK client for token, creating it on first use.
+    
+    The SDK keeps its own connection pool per client, so the listener and the updater
+    share one client instead of each holding a separate pool to api.smartsheet.com.
+    
+    Args:
+        token: Smartsheet API access token
+        
+    Returns:
+        smartsheet.Smartsheet: Client that raises SDK errors as exceptions
+    """
+    # Imported here so Graph-only callers of this module do not load the SDK
+    import smartsheet
+    client = smartsheet.Smartsheet(token)
+    client.errors_as_exceptions(True)
+    return client
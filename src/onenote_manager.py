@@ -3,19 +3,93 @@ OneNote management operations.
 Handles creating and managing OneNote notebooks and sections.
 """
 
+import functools
 import logging
 import re
-from typing import Dict, Any, Optional, List
+import time
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+from urllib.parse import urlencode, quote
 import json
+from html import escape
 try:
-    from .graph_client import graph_client
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    from .graph_client import graph_client, submit_in_context, _error_status
     from .config import config
 except ImportError:
-    from graph_client import graph_client
+    from graph_client import graph_client, submit_in_context, _error_status
     from config import config
 
 logger = logging.getLogger(__name__)
 
+# Concurrent section creations when a notebook's sections cannot be batched
+_SECTION_WORKERS = 8
+
+# Concurrent one-by-one page creations in bulk runs; bounded to stay clear of OneNote throttling
+_PAGE_WORKERS = 16
+
+# Resolved notebooks/sections are reused for this long; only found or created items are cached
+_LOOKUP_CACHE_TTL = 300  # seconds
+
+# Deletes the characters OneNote rejects in notebook and section names: ? * \ / : < > | '
+_FORBIDDEN_NAME_TABLE = str.maketrans("", "", "?*\\/:<>|'")
+
+# Page-building patterns, compiled once rather than on every value of every page
+# Literal backslashes: a run ending in n's (escaped newline) becomes a space, any other run is dropped
+_LITERAL_BACKSLASH_RE = re.compile(r'\\+(n+)?')
+# Page skeleton around the table rows, already minified; only the title varies
+_PAGE_HEAD = (
+    "<!DOCTYPE html><html><head><title>{title}</title><meta charset='utf-8' /></head>"
+    "<body><table border='1' cellpadding='5' style='border-collapse:collapse;'>"
+    "<thead><tr><th>Field</th><th>Value</th></tr></thead><tbody>"
+)
+_PAGE_TAIL = "</tbody></table></body></html>"
+# Cell link markup; callers pass already-escaped values
+_LINK_TEMPLATE = '<a href="{url}">{label}</a>'
+_MAILTO_TEMPLATE = '<a href="mailto:{email}">{email}</a>'
+# CR/LF/tab to spaces in one pass; a CRLF pair becomes two spaces, which the split drops
+_CLEAN_TABLE = str.maketrans("\r\n\t", "   ")
+# Tokens dropped from cleaned page text
+_SKIP_TOKENS = frozenset(('"', "'"))
+
+# Standard sections for BVC project notebooks
+_STANDARD_SECTIONS: Tuple[str, ...] = (
+    "Project Overview",
+    "Requirements",
+    "Design",
+    "Development",
+    "Testing",
+    "Deployment",
+    "Documentation",
+    "Meeting Notes",
+)
+
+# Mapping of Smartsheet column IDs to friendly names for opportunity pages (includes RFP Scope and DE Consulting Scope)
+_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("5878702367002500", "Project Category"),
+    ("3534360453271428", "Project Name"),
+    ("1375102739632004", "Description"),
+    ("1475623376867204", "Company Name"),
+    ("7911781646421892", "Customer Contact"),
+    ("1611314616291204", "Site Address"),
+    ("3408182019051396", "Opportunity ID"),
+    ("677356797906820", "RFP Scope"),
+    ("1639045752639364", "DE Consulting Scope"),
+)
+# Columns that need special rendering: DE Consulting Scope is multi-select, the Smartsheet link column is a hyperlink
+_MULTI_SELECT_COLUMN_ID = "1639045752639364"
+_HYPERLINK_COLUMN_ID = "1838548451020676"
+
+
+def _literal_backslash_replacement(match: re.Match) -> str:
+    """Return a space for a literal escaped newline and nothing for other literal backslashes."""
+    return ' ' if match.group(1) else ''
+
 
 def get_cell_str(cell) -> str:
     """
@@ -46,11 +120,8 @@ def sanitize_onenote_name(name: str) -> str:
     if not name:
         return 'Untitled'
     
-    # Remove forbidden characters: ? * \ / : < > | '
-    sanitized = re.sub(r"[?*\\\\/:<>|']", "", name)
-    
-    # Remove leading/trailing whitespace
-    sanitized = sanitized.strip()
+    # Remove forbidden characters, then leading/trailing whitespace
+    sanitized = name.translate(_FORBIDDEN_NAME_TABLE).strip()
     
     # If empty after sanitization, use default
     if not sanitized:
@@ -59,28 +130,83 @@ def sanitize_onenote_name(name: str) -> str:
     return sanitized
 
 
+def _query_url(path: str, params: Dict[str, Any]) -> str:
+    """Build a Graph batch sub-request URL (relative to /v1.0) with an encoded query string."""
+    return f"{path}?{urlencode(params, safe='$,()', quote_via=quote)}"
+
+
+def _dumps_pretty(obj: Any) -> str:
+    """Indented JSON for log output, encoded with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, indent=2)
+
+
+def _odata_quote(value: str) -> str:
+    """Escape a value for use inside a single-quoted OData string literal."""
+    return value.replace("'", "''")
+
+
+def _onenote_web_url(item: Dict[str, Any]) -> Optional[str]:
+    """Return the oneNoteWebUrl of a notebook/section/page, if it has one."""
+    links = item.get('links') or {}
+    web_url = links.get('oneNoteWebUrl') or {}
+    return web_url.get('href')
+
+
+@functools.lru_cache(maxsize=1024)
+def _public_notebook_name(customer_str: str) -> str:
+    """Return the sanitized '<Customer> - Public' notebook name; memoized per customer."""
+    return f"{sanitize_onenote_name(customer_str)} - Public"
+
+
 def get_display_text(cell):
     """
     Extract the display value for a cell, or value, or empty string.
     If the cell has a hyperlink, return an HTML link.
     If the value looks like an email, return a mailto link.
+    The result is HTML: cell text is escaped.
     """
-    if isinstance(cell, dict):
-        display = cell.get('displayValue') or cell.get('value') or ''
+    # Smartsheet cells are plain dicts, so exact type checks are enough on this per-cell path
+    cell_type = type(cell)
+    if cell_type is dict:
+        display_value = cell.get('displayValue')
+        value = cell.get('value')
+        display = display_value if display_value else (value if value else '')
         hyperlink = cell.get('hyperlink')
         # If hyperlink is a dict with a url, render as a link
-        if hyperlink and isinstance(hyperlink, dict) and hyperlink.get('url'):
-            url = hyperlink['url']
+        if type(hyperlink) is dict and (url := hyperlink.get('url')):
             label = display or hyperlink.get('label') or url
-            return f'<a href="{url}">{label}</a>'
+            return _LINK_TEMPLATE.format(url=escape(url), label=escape(str(label)))
         # If value looks like an email, render as mailto
-        value = cell.get('value')
-        if value and isinstance(value, str) and '@' in value and not display:
-            return f'<a href="mailto:{value}">{value}</a>'
-        return display
-    elif isinstance(cell, str) and '@' in cell:
-        return f'<a href="mailto:{cell}">{cell}</a>'
-    return str(cell) if cell is not None else ''
+        if not display and value and type(value) is str and '@' in value:
+            return _MAILTO_TEMPLATE.format(email=escape(value))
+        return escape(str(display))
+    if cell_type is str:
+        return _MAILTO_TEMPLATE.format(email=escape(cell)) if '@' in cell else escape(cell)
+    return escape(str(cell)) if cell is not None else ''
+
+
+def _format_multi_select(cell) -> str:
+    """
+    Render a multi-select cell (e.g. DE Consulting Scope) as a comma-separated, escaped list.
+    Cells that are not lists fall back to get_display_text.
+    """
+    # If value is a dict with a list, join the list
+    if isinstance(cell, dict):
+        value = cell.get('displayValue') or cell.get('value')
+        if isinstance(value, list):
+            return escape(', '.join(str(item) for item in value))
+        return escape(str(value or ''))
+    if isinstance(cell, list):
+        return escape(', '.join(str(item) for item in cell))
+    return get_display_text(cell)
+
+
+# Per-column cell renderers for _build_two_column_table_html; other columns use get_display_text
+_COLUMN_FORMATTERS = {
+    _MULTI_SELECT_COLUMN_ID: _format_multi_select,
+}
 
 
 class OneNoteManager:
@@ -89,6 +215,22 @@ class OneNoteManager:
     def __init__(self):
         """Initialize the OneNote manager."""
         self.site_id = config.SHAREPOINT_SITE_ID
+        self._notebook_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._section_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        # (site_id, notebook name) -> (timestamp, notebook) for site-level notebooks, shared by
+        # every row of the same customer in a bulk run
+        self._site_notebook_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        # (section_id, page title) -> (timestamp, page) for pages found or created
+        self._page_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._site_notebook_lock = threading.Lock()
+    
+    @staticmethod
+    def _cache_get(cache: Dict[Any, Tuple[float, Dict[str, Any]]], key: Any) -> Optional[Dict[str, Any]]:
+        """Return a cached notebook/section if it is younger than _LOOKUP_CACHE_TTL."""
+        cached = cache.get(key)
+        if cached and time.time() - cached[0] < _LOOKUP_CACHE_TTL:
+            return cached[1]
+        return None
     
     def ensure_notebook(self, company_name: str) -> Dict[str, Any]:
         """
@@ -118,6 +260,7 @@ class OneNoteManager:
             )
             
             logger.info(f"Successfully created OneNote notebook: {notebook.get('id')}")
+            self._notebook_cache[company_name] = (time.time(), notebook)
             return notebook
             
         except Exception as e:
@@ -134,6 +277,9 @@ class OneNoteManager:
         Returns:
             Optional[Dict[str, Any]]: Notebook information if found, None otherwise
         """
+        cached = self._cache_get(self._notebook_cache, display_name)
+        if cached is not None:
+            return cached
         try:
             notebooks_response = graph_client.get_user_notebooks_delegated(
                 display_name=display_name
@@ -143,6 +289,7 @@ class OneNoteManager:
             
             if notebooks:
                 logger.info(f"Found existing notebook '{display_name}' with ID: {notebooks[0].get('id')}")
+                self._notebook_cache[display_name] = (time.time(), notebooks[0])
                 return notebooks[0]
             else:
                 logger.info(f"No existing notebook found with name '{display_name}'")
@@ -179,6 +326,7 @@ class OneNoteManager:
             )
             
             logger.info(f"Successfully created OneNote section: {section.get('id')}")
+            self._section_cache[(notebook_id, section_name)] = (time.time(), section)
             return section
             
         except Exception as e:
@@ -261,13 +409,15 @@ class OneNoteManager:
         Returns:
             Optional[Dict[str, Any]]: Section information if found, None otherwise
         """
+        cached = self._cache_get(self._section_cache, (notebook_id, section_name))
+        if cached is not None:
+            return cached
         try:
-            sections = self.get_notebook_sections(notebook_id)
-            
-            for section in sections:
-                if section.get('displayName') == section_name:
-                    logger.info(f"Found section '{section_name}' with ID: {section.get('id')}")
-                    return section
+            match = graph_client.find_section_by_name(None, notebook_id, section_name)
+            if match is not None:
+                self._section_cache[(notebook_id, section_name)] = (time.time(), match)
+                logger.info(f"Found section '{section_name}' with ID: {match.get('id')}")
+                return match
             
             logger.info(f"No section found with name '{section_name}' in notebook {notebook_id}")
             return None
@@ -279,7 +429,7 @@ class OneNoteManager:
     def create_project_notebook_with_sections(
         self, 
         project_name: str, 
-        section_names: Optional[List[str]] = None
+        section_names: Optional[Sequence[str]] = None
     ) -> Dict[str, Any]:
         """
         Create a complete OneNote notebook for a project with multiple sections.
@@ -302,16 +452,12 @@ class OneNoteManager:
             if not notebook_id:
                 raise Exception("Failed to get notebook ID")
             
-            # Create sections
-            sections = []
-            for section_name in section_names:
-                try:
-                    section = self.create_section(notebook_id, section_name)
-                    sections.append(section)
-                except Exception as e:
-                    logger.error(f"Failed to create section '{section_name}': {e}")
-                    # Continue with other sections
-            
+            try:
+                sections = self._create_sections_batched(notebook_id, section_names)
+            except Exception as e:
+                # $batch itself failed; overlap individual creations instead of running them serially
+                logger.warning(f"Batched section creation failed, creating sections concurrently: {e}")
+                sections = self._create_sections_concurrently(notebook_id, section_names)            
             result = {
                 'notebook': notebook,
                 'sections': sections,
@@ -325,6 +471,69 @@ class OneNoteManager:
             logger.error(f"Failed to create project notebook for '{project_name}': {e}")
             raise
     
+    def _create_sections_batched(self, notebook_id: str, section_names: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Create sections through Graph JSON batching: one round trip per 20 sections.
+        
+        Args:
+            notebook_id: OneNote notebook ID
+            section_names: Section names
+            
+        Throttled sub-requests are resent by graph_batch itself.
+        
+        Returns:
+            List[Dict[str, Any]]: Created sections, in order; failed sections are logged and skipped
+        """
+        endpoint = f"/me/onenote/notebooks/{notebook_id}/sections"
+        responses = graph_client.graph_batch([
+            {
+                "id": str(i),
+                "method": "POST",
+                "url": endpoint,
+                "body": {"displayName": section_name}
+            }
+            for i, section_name in enumerate(section_names)
+        ], delegated=True)
+        sections = []
+        for i, section_name in enumerate(section_names):
+            sub_response = responses.get(str(i), {})
+            if sub_response.get('status') in (200, 201):
+                section = sub_response.get('body', {})
+                self._section_cache[(notebook_id, section_name)] = (time.time(), section)
+                sections.append(section)
+            else:
+                # Continue with other sections
+                error = sub_response.get('body', {}).get('error', {})
+                logger.error(f"Failed to create section '{section_name}': {sub_response.get('status')} {error.get('message', '')}")
+        return sections
+    
+    def _create_sections_concurrently(self, notebook_id: str, section_names: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Create sections with one request each, overlapping the round trips on a thread pool.
+        
+        Args:
+            notebook_id: OneNote notebook ID
+            section_names: Section names
+            
+        Returns:
+            List[Dict[str, Any]]: Created sections, in order; failed sections are logged and skipped
+        """
+        if not section_names:
+            return []
+        with ThreadPoolExecutor(max_workers=min(_SECTION_WORKERS, len(section_names))) as executor:
+            futures = [
+                submit_in_context(executor, self.create_section, notebook_id, section_name)
+                for section_name in section_names
+            ]
+        sections = []
+        for section_name, future in zip(section_names, futures):
+            try:
+                sections.append(future.result())
+            except Exception as e:
+                # create_section already logged the failure; continue with other sections
+                logger.error(f"Failed to create section '{section_name}': {e}")
+        return sections
+    
     def list_all_notebooks(self) -> List[Dict[str, Any]]:
         """
         List all OneNote notebooks in the SharePoint site.
@@ -362,6 +571,20 @@ class OneNoteManager:
         try:
             endpoint = f"/sites/{self.site_id}/onenote/notebooks/{notebook_id}"
             graph_client.graph_request_delegated("DELETE", endpoint)
+            self._notebook_cache = {
+                name: entry for name, entry in self._notebook_cache.items() if entry[1].get('id') != notebook_id
+            }
+            section_ids = {entry[1].get('id') for key, entry in self._section_cache.items() if key[0] == notebook_id}
+            self._section_cache = {
+                key: entry for key, entry in self._section_cache.items() if key[0] != notebook_id
+            }
+            self._page_cache = {
+                key: entry for key, entry in self._page_cache.items() if key[0] not in section_ids
+            }
+            with self._site_notebook_lock:
+                self._site_notebook_cache = {
+                    key: entry for key, entry in self._site_notebook_cache.items() if entry[1].get('id') != notebook_id
+                }
             
             logger.info(f"Successfully deleted notebook {notebook_id}")
             return True
@@ -380,19 +603,7 @@ class OneNoteManager:
         Returns:
             Dict[str, Any]: Created notebook information
         """
-        # Define standard sections for BVC projects
-        standard_sections = [
-            "Project Overview",
-            "Requirements",
-            "Design",
-            "Development",
-            "Testing",
-            "Deployment",
-            "Documentation",
-            "Meeting Notes"
-        ]
-        
-        return self.create_project_notebook_with_sections(project_name, standard_sections)
+        return self.create_project_notebook_with_sections(project_name, _STANDARD_SECTIONS)
 
     def _format_notebook_name(self, customer_name) -> str:
         """
@@ -407,15 +618,93 @@ class OneNoteManager:
         # Extract string value from cell if it's a dict
         customer_str = get_cell_str(customer_name)
         
-        # Sanitize the name
-        sanitized_customer = sanitize_onenote_name(customer_str)
-        
-        # Format as "Customer - Public"
-        notebook_name = f"{sanitized_customer} - Public"
+        notebook_name = _public_notebook_name(customer_str)
         
         logger.info(f"Formatted notebook name: '{customer_str}' -> '{notebook_name}'")
         return notebook_name
 
+    def _row_names(self, smartsheet_data: dict, notebook_name: str = '', section_name: str = '') -> Tuple[str, str, str]:
+        """
+        Derive the notebook name, section name and page title for a Smartsheet row.
+        
+        Args:
+            smartsheet_data: Row data keyed by column ID
+            notebook_name: Fallback customer name when the row has none
+            section_name: Fallback project name when the row has none
+            
+        Returns:
+            Tuple[str, str, str]: Notebook name, sanitized section name and page title
+        """
+        # Always use customer name + ' - Public' for the notebook name
+        customer_name = smartsheet_data.get('1475623376867204', notebook_name)
+        notebook_name = self._format_notebook_name(customer_name)
+        
+        # Format and sanitize the section name
+        project_name = smartsheet_data.get('3534360453271428', section_name)  # Project Name
+        opp_id = smartsheet_data.get('3408182019051396', '')  # Opportunity ID
+        
+        # Extract string values and sanitize
+        project_str = get_cell_str(project_name)
+        opp_str = get_cell_str(opp_id)
+        
+        # Build section name as "Opp ID - ProjectName" (reversed format)
+        if opp_str:
+            section_name = f"{opp_str} - {project_str}"
+        else:
+            section_name = project_str
+        
+        # Sanitize the section name
+        section_name = sanitize_onenote_name(section_name)
+        
+        logger.info(f"Formatted section name: '{section_name}'")
+        
+        # Build the page title as '{OpportunityID} - {ProjectName}' (reversed format)
+        page_title = f"{opp_str} - {project_str}" if opp_str else project_str
+        return notebook_name, section_name, page_title
+    
+    def _ensure_site_notebook(self, site_id: str, notebook_name: str) -> Dict[str, Any]:
+        """
+        Get a site-level notebook by name, creating it if it doesn't exist.
+        
+        Resolved notebooks are cached per site and name, and sections returned alongside a
+        looked-up notebook seed the section cache.
+        
+        Args:
+            site_id: SharePoint Site ID
+            notebook_name: Notebook display name
+            
+        Returns:
+            Dict[str, Any]: Notebook information
+            
+        Raises:
+            Exception: If the notebook can be neither found nor created
+        """
+        key = (site_id, notebook_name)
+        with self._site_notebook_lock:
+            cached = self._cache_get(self._site_notebook_cache, key)
+        if cached is not None:
+            return cached
+        # Check if notebook exists at the site level; its sections come back in the same response
+        notebook = graph_client.get_site_notebook_with_sections(site_id, notebook_name)
+        if notebook:
+            now = time.time()
+            for section in notebook.get('sections') or []:
+                self._section_cache[(notebook.get('id'), section.get('displayName'))] = (now, section)
+        else:
+            logger.info(f"Creating OneNote notebook at site level: /sites/{site_id}/onenote/notebooks with displayName: {notebook_name}")
+            try:
+                # A 409 (created concurrently or already existed) yields the existing notebook
+                notebook = graph_client.create_notebook(site_id, notebook_name, existing_on_conflict=True)
+            except Exception as e:
+                logger.error(f"Failed to create notebook at site level: {e}")
+                raise
+            if not notebook:
+                logger.error(f"Notebook exists but could not be found after 409: {notebook_name}")
+                raise Exception(f"Notebook exists but could not be found: {notebook_name}")
+        with self._site_notebook_lock:
+            self._site_notebook_cache[key] = (time.time(), notebook)
+        return notebook
+    
     def ensure_project_section_with_metadata(self, site_id: str, parent_folder_id: str, notebook_name: str, section_name: str, smartsheet_data: dict) -> Dict[str, Any]:
         """
         Ensure a OneNote notebook exists at the site level (not in a subfolder), create if it doesn't, or add a section if it does. Then create a page in the section with Smartsheet data.
@@ -430,59 +719,20 @@ class OneNoteManager:
         Raises:
             Exception: If section or page creation fails
         """
-        logger.info(f"Raw Smartsheet data for page: {json.dumps(smartsheet_data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Raw Smartsheet data for page: %s", _dumps_pretty(smartsheet_data))
         try:
-            # Always use customer name + ' - Public' for the notebook name
-            customer_name = smartsheet_data.get('1475623376867204', notebook_name)
-            notebook_name = self._format_notebook_name(customer_name)
-            
-            # Format and sanitize the section name
-            project_name = smartsheet_data.get('3534360453271428', section_name)  # Project Name
-            opp_id = smartsheet_data.get('3408182019051396', '')  # Opportunity ID
-            
-            # Extract string values and sanitize
-            project_str = get_cell_str(project_name)
-            opp_str = get_cell_str(opp_id)
-            
-            # Build section name as "Opp ID - ProjectName" (reversed format)
-            if opp_str:
-                section_name = f"{opp_str} - {project_str}"
-            else:
-                section_name = project_str
-            
-            # Sanitize the section name
-            section_name = sanitize_onenote_name(section_name)
-            
-            logger.info(f"Formatted section name: '{section_name}'")
+            notebook_name, section_name, page_title = self._row_names(smartsheet_data, notebook_name, section_name)
             
             # The notebook will be created at the site level, named after the folder/project
-            # Check if notebook exists at the site level
-            notebooks_response = graph_client.get_site_notebooks(site_id=site_id)
-            notebooks = notebooks_response.get('value', [])
-            notebook = next((nb for nb in notebooks if nb.get('displayName') == notebook_name), None)
-            if not notebook:
-                logger.info(f"Creating OneNote notebook at site level: /sites/{site_id}/onenote/notebooks with displayName: {notebook_name}")
-                try:
-                    notebook = graph_client.create_notebook(site_id, notebook_name)
-                except Exception as e:
-                    # If 409, try to find the notebook again (it may have just been created or already existed)
-                    response = getattr(e, 'response', None)
-                    status_code = getattr(response, 'status_code', None) if response is not None else None
-                    if status_code == 409:
-                        logger.warning(f"409 Conflict: Notebook already exists at site level, searching for existing notebook '{notebook_name}'")
-                        notebooks_response = graph_client.get_site_notebooks(site_id=site_id)
-                        notebooks = notebooks_response.get('value', [])
-                        notebook = next((nb for nb in notebooks if nb.get('displayName') == notebook_name), None)
-                        if not notebook:
-                            logger.error(f"Notebook exists but could not be found after 409: {notebook_name}")
-                            raise Exception(f"Notebook exists but could not be found: {notebook_name}")
-                    else:
-                        logger.error(f"Failed to create notebook at site level: {e}")
-                        raise
+            notebook = self._ensure_site_notebook(site_id, notebook_name)
             notebook_id = notebook.get('id')
             if not notebook_id:
                 raise Exception("Failed to get notebook ID")
-            # Check if section already exists using site-based endpoint
+            # Check if section already exists; sections seen while resolving the notebook are cached.
+            # The page is then looked up within the section, never across the whole site.
+            page_known = False
+            existing_page = None
             existing_section = self.get_section_by_name_site(site_id, notebook_id, section_name)
             if existing_section:
                 logger.info(f"Section '{section_name}' already exists in notebook '{notebook_name}'")
@@ -490,21 +740,30 @@ class OneNoteManager:
             else:
                 # Create a section with the section name using site-based endpoint
                 logger.info(f"Calling Graph API: /sites/{site_id}/onenote/notebooks/{notebook_id}/sections with displayName: {section_name}")
-                section = graph_client.create_site_notebook_section(
-                    site_id=site_id,
-                    notebook_id=notebook_id,
-                    section_name=section_name
-                )
+                try:
+                    section = graph_client.create_site_notebook_section(
+                        site_id=site_id,
+                        notebook_id=notebook_id,
+                        section_name=section_name
+                    )
+                except Exception as e:
+                    if _error_status(e) == 404:
+                        # The cached notebook was deleted; resolve it afresh next time
+                        logger.warning(f"Notebook '{notebook_name}' ({notebook_id}) no longer exists; evicting it from the cache")
+                        with self._site_notebook_lock:
+                            self._site_notebook_cache.pop((site_id, notebook_name), None)
+                    raise
+                self._section_cache[(notebook_id, section_name)] = (time.time(), section)
                 logger.info(f"Successfully created project section '{section_name}' in notebook '{notebook_name}'")
+                # A section we just created has no pages yet
+                page_known = True
             section_id = section.get('id')
             if not section_id:
                 raise Exception("Failed to get section ID")
-            # Build the page title as '{OpportunityID} - {ProjectName}' (reversed format)
-            # Use the already extracted and sanitized values
-            page_title = f"{opp_str} - {project_str}" if opp_str else project_str
             
             # Check if a page with this title already exists in the section
-            existing_page = self.get_page_by_title_site(site_id, section_id, page_title)
+            if not page_known:
+                existing_page = self.get_page_by_title_site(site_id, section_id, page_title)
             if existing_page:
                 logger.info(f"Page with title '{page_title}' already exists in section '{section_name}', skipping page creation")
                 page = existing_page
@@ -513,6 +772,7 @@ class OneNoteManager:
                 page_html = self._build_two_column_table_html(page_title, smartsheet_data)
                 logger.info(f"Creating page in section '{section_name}' with Smartsheet data table")
                 page = graph_client.create_page_in_section(site_id, section_id, page_html)
+                self._page_cache[(section_id, page_title)] = (time.time(), page)
                 logger.info(f"Successfully created page in section '{section_name}'")
             
             # Extract URLs from the responses
@@ -541,90 +801,353 @@ class OneNoteManager:
             logger.error(f"Failed to ensure project section '{section_name}' in notebook '{notebook_name}': {e}")
             raise
 
+    def bulk_ensure(self, site_id: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Bulk form of ensure_project_section_with_metadata for many Smartsheet rows.
+        
+        Notebooks, sections and pages are each looked up and created through Graph JSON
+        batches of up to 20 sub-requests, so a run costs O(rows / 20) round trips instead of
+        several per row. Anything a batch could not settle falls back to the per-item calls.
+        
+        Args:
+            site_id: SharePoint Site ID
+            rows: Smartsheet row data dicts keyed by column ID
+            
+        Returns:
+            List[Dict[str, Any]]: One result per row, in input order, shaped like the result of
+            ensure_project_section_with_metadata; rows that could not be completed carry
+            'notebook_name' and 'error' only
+        """
+        names = [self._row_names(row) for row in rows]
+        
+        notebooks, new_notebook_ids = self._bulk_notebooks(site_id, {nb_name for nb_name, _, _ in names})
+        
+        section_keys = {(notebooks[nb_name]['id'], sec_name) for nb_name, sec_name, _ in names if nb_name in notebooks}
+        known = {key: self._cache_get(self._section_cache, key) for key in section_keys}
+        known = {key: section for key, section in known.items() if section and section.get('id')}
+        
+        # Pages in sections we already know about are found/created on a worker thread while
+        # the remaining sections are looked up and created
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            early_pages = submit_in_context(
+                executor, self._bulk_pages, site_id, self._page_rows(rows, names, notebooks, known), set()
+            )
+            sections, new_section_ids = self._bulk_sections(site_id, section_keys - known.keys(), new_notebook_ids)
+            pages = self._bulk_pages(site_id, self._page_rows(rows, names, notebooks, sections), new_section_ids)
+            pages.update(early_pages.result())
+        sections.update(known)
+        
+        results = []
+        for nb_name, sec_name, title in names:
+            notebook = notebooks.get(nb_name)
+            section = sections.get((notebook['id'], sec_name)) if notebook else None
+            page = pages.get((section['id'], title)) if section else None
+            if page is None:
+                failed = 'notebook' if notebook is None else 'section' if section is None else 'page'
+                results.append({'notebook_name': nb_name, 'error': f"Failed to ensure {failed} for '{title}'"})
+                continue
+            results.append({
+                'notebook': notebook,
+                'section': section,
+                'page': page,
+                'notebook_url': _onenote_web_url(notebook),
+                'section_url': _onenote_web_url(section),
+                'notebook_name': nb_name
+            })
+        logger.info(f"Bulk ensured {sum('error' not in r for r in results)}/{len(rows)} rows in site {site_id}")
+        return results
+    
+    @staticmethod
+    def _page_rows(
+        rows: List[Dict[str, Any]],
+        names: List[Tuple[str, str, str]],
+        notebooks: Dict[str, Dict[str, Any]],
+        sections: Dict[Tuple[str, str], Dict[str, Any]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Map (section_id, page title) to the first row that supplies its content, for rows whose section is in sections."""
+        page_rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for row, (nb_name, sec_name, title) in zip(rows, names):
+            notebook = notebooks.get(nb_name)
+            section = sections.get((notebook['id'], sec_name)) if notebook else None
+            if section:
+                page_rows.setdefault((section['id'], title), row)
+        return page_rows
+    
+    @staticmethod
+    def _batch_by_key(sub_requests: Dict[Any, Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Send delegated batch sub-requests keyed by arbitrary keys.
+        
+        Args:
+            sub_requests: Sub-requests without 'id', keyed by caller-chosen keys
+            
+        Returns:
+            Dict[Any, Dict[str, Any]]: Sub-response for every key; an empty dict where none came
+            back (including when the batch itself failed)
+        """
+        if not sub_requests:
+            return {}
+        keys = list(sub_requests)
+        try:
+            responses = graph_client.graph_batch(
+                [{'id': str(i), **sub_requests[key]} for i, key in enumerate(keys)],
+                delegated=True
+            )
+        except Exception as e:
+            logger.error(f"Graph batch of {len(keys)} requests failed: {e}")
+            responses = {}
+        return {key: responses.get(str(i), {}) for i, key in enumerate(keys)}
+    
+    def _bulk_notebooks(self, site_id: str, notebook_names: set) -> Tuple[Dict[str, Dict[str, Any]], set]:
+        """
+        Resolve or create site notebooks by name with batched requests.
+        
+        Returns:
+            Tuple[Dict[str, Dict[str, Any]], set]: Notebooks by name, and the IDs of notebooks
+            created here (which have no sections yet)
+        """
+        notebooks: Dict[str, Dict[str, Any]] = {}
+        created: set = set()
+        fallback = []
+        lookups = {}
+        for name in notebook_names:
+            with self._site_notebook_lock:
+                cached = self._cache_get(self._site_notebook_cache, (site_id, name))
+            if cached is not None:
+                notebooks[name] = cached
+            else:
+                lookups[name] = {
+                    'method': 'GET',
+                    'url': _query_url(f"/sites/{site_id}/onenote/notebooks", {
+                        "$filter": f"displayName eq '{_odata_quote(name)}'",
+                        "$expand": "sections($select=id,displayName,links)",
+                        "$top": 1
+                    })
+                }
+        
+        creates = {}
+        now = time.time()
+        for name, response in self._batch_by_key(lookups).items():
+            if response.get('status') != 200:
+                fallback.append(name)
+                continue
+            found = (response.get('body') or {}).get('value', [])
+            if found:
+                notebooks[name] = found[0]
+                for section in found[0].get('sections') or []:
+                    self._section_cache[(found[0].get('id'), section.get('displayName'))] = (now, section)
+            else:
+                creates[name] = {
+                    'method': 'POST',
+                    'url': f"/sites/{site_id}/onenote/notebooks",
+                    'body': {"displayName": name}
+                }
+        
+        for name, response in self._batch_by_key(creates).items():
+            if response.get('status') == 201 and (response.get('body') or {}).get('id'):
+                notebooks[name] = response['body']
+                created.add(response['body']['id'])
+            else:
+                fallback.append(name)
+        
+        with self._site_notebook_lock:
+            for name in lookups:
+                if name in notebooks:
+                    self._site_notebook_cache[(site_id, name)] = (now, notebooks[name])
+        # Conflicts and odd statuses get the sequential path, which handles 409 and $expand fallback
+        for name in fallback:
+            try:
+                notebooks[name] = self._ensure_site_notebook(site_id, name)
+            except Exception as e:
+                logger.error(f"Failed to ensure notebook '{name}': {e}")
+        return {name: nb for name, nb in notebooks.items() if nb.get('id')}, created
+    
+    def _bulk_sections(self, site_id: str, section_keys: set, new_notebook_ids: set) -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], set]:
+        """
+        Resolve or create (notebook_id, section name) sections with batched requests.
+        
+        Returns:
+            Tuple[Dict[Tuple[str, str], Dict[str, Any]], set]: Sections by key, and the IDs of
+            sections created here (which have no pages yet)
+        """
+        sections: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        created: set = set()
+        lookups = {}
+        to_create = []
+        for key in section_keys:
+            notebook_id, name = key
+            cached = self._cache_get(self._section_cache, key)
+            if cached is not None:
+                sections[key] = cached
+            elif notebook_id in new_notebook_ids:
+                to_create.append(key)
+            else:
+                lookups[key] = {
+                    'method': 'GET',
+                    'url': _query_url(f"/sites/{site_id}/onenote/notebooks/{notebook_id}/sections", {
+                        "$filter": f"displayName eq '{_odata_quote(name)}'",
+                        "$select": "id,displayName,links",
+                        "$top": 1
+                    })
+                }
+        
+        fallback = []
+        for key, response in self._batch_by_key(lookups).items():
+            found = (response.get('body') or {}).get('value', []) if response.get('status') == 200 else None
+            if found:
+                sections[key] = found[0]
+            elif found is not None:
+                to_create.append(key)
+            else:
+                fallback.append(key)
+        
+        creates = {
+            key: {
+                'method': 'POST',
+                'url': f"/sites/{site_id}/onenote/notebooks/{key[0]}/sections",
+                'body': {"displayName": key[1]}
+            }
+            for key in to_create
+        }
+        for key, response in self._batch_by_key(creates).items():
+            if response.get('status') == 201 and (response.get('body') or {}).get('id'):
+                sections[key] = response['body']
+                created.add(response['body']['id'])
+            else:
+                fallback.append(key)
+        
+        for notebook_id, name in fallback:
+            try:
+                section = self.get_section_by_name_site(site_id, notebook_id, name)
+                if section is None:
+                    section = graph_client.create_site_notebook_section(
+                        site_id=site_id,
+                        notebook_id=notebook_id,
+                        section_name=name
+                    )
+                sections[(notebook_id, name)] = section
+            except Exception as e:
+                logger.error(f"Failed to ensure section '{name}' in notebook {notebook_id}: {e}")
+        
+        now = time.time()
+        for key, section in sections.items():
+            self._section_cache[key] = (now, section)
+        return {key: section for key, section in sections.items() if section.get('id')}, created
+    
+    def _bulk_pages(self, site_id: str, page_rows: Dict[Tuple[str, str], Dict[str, Any]], new_section_ids: set) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Find or create a page per (section_id, title) with batched requests.
+        
+        Page bodies are sent as base64-encoded text/html, as Graph batching requires for
+        non-JSON content.
+        
+        Returns:
+            Dict[Tuple[str, str], Dict[str, Any]]: Existing or created pages by key
+        """
+        pages: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for key in page_rows:
+            cached = self._cache_get(self._page_cache, key)
+            if cached is not None:
+                pages[key] = cached
+        lookups = {
+            key: {
+                'method': 'GET',
+                'url': _query_url(f"/sites/{site_id}/onenote/sections/{key[0]}/pages", {
+                    "$filter": f"title eq '{_odata_quote(key[1])}'",
+                    "$select": "id,title,links",
+                    "$top": 1
+                })
+            }
+            for key in page_rows if key[0] not in new_section_ids and key not in pages
+        }
+        to_create = [key for key in page_rows if key[0] in new_section_ids]
+        fallback = []
+        for key, response in self._batch_by_key(lookups).items():
+            found = (response.get('body') or {}).get('value', []) if response.get('status') == 200 else None
+            if found:
+                logger.info(f"Page with title '{key[1]}' already exists in section {key[0]}, skipping page creation")
+                pages[key] = found[0]
+            elif found is not None:
+                to_create.append(key)
+            else:
+                fallback.append(key)
+        
+        html_by_key = {key: self._build_two_column_table_html(key[1], page_rows[key]) for key in to_create}
+        creates = {
+            key: {
+                'method': 'POST',
+                'url': f"/sites/{site_id}/onenote/sections/{key[0]}/pages",
+                'headers': {"Content-Type": "text/html"},
+                'body': base64.b64encode(html_by_key[key].encode('utf-8')).decode('ascii')
+            }
+            for key in to_create
+        }
+        # Pages a batch create definitely did not make (4xx); any other failure, such as a 5xx
+        # or a missing sub-response, may still have created the page
+        rejected = set()
+        for key, response in self._batch_by_key(creates).items():
+            if response.get('status') == 201 and response.get('body'):
+                pages[key] = response['body']
+            else:
+                if 400 <= (response.get('status') or 0) < 500:
+                    rejected.add(key)
+                fallback.append(key)
+        
+        def ensure_page(key: Tuple[str, str]) -> Dict[str, Any]:
+            section_id, title = key
+            # Look the page up before re-creating it unless the batch create was rejected outright
+            page = None if key in rejected else self.get_page_by_title_site(site_id, section_id, title)
+            if page is None:
+                page_html = html_by_key.get(key) or self._build_two_column_table_html(title, page_rows[key])
+                page = graph_client.create_page_in_section(site_id, section_id, page_html)
+            return page
+        
+        # Pages take seconds to build server-side, so the one-by-one fallbacks overlap
+        if fallback:
+            with ThreadPoolExecutor(max_workers=min(_PAGE_WORKERS, len(fallback))) as executor:
+                futures = [submit_in_context(executor, ensure_page, key) for key in fallback]
+            for key, future in zip(fallback, futures):
+                try:
+                    pages[key] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to ensure page '{key[1]}' in section {key[0]}: {e}")
+        
+        now = time.time()
+        for key, page in pages.items():
+            self._page_cache[key] = (now, page)
+        return pages
+    
     def _clean_text_for_onenote(self, text, page_title=None):
         if not isinstance(text, str):
             return text
         # Remove all actual newlines, carriage returns, and literal \n (single and double-escaped)
-        text = text.replace('\r\n', ' ').replace('\n', ' ').replace('\n', ' ').replace('\r', ' ').replace('\n', ' ')
-        # Remove any repeated whitespace
-        text = re.sub(r'\\n+', ' ', text)
-        text = re.sub(r'\\+', '', text)
-        # Split into lines, filter out lines that are empty, just quotes, or match the page title
-        lines = [line.strip() for line in text.split(' ') if line.strip() and line.strip() not in ['"', "'"]]
-        if page_title:
-            lines = [line for line in lines if line != page_title]
-        # Remove lines that are just a sequence of n's (e.g., nnnnn)
-        lines = [line for line in lines if not re.fullmatch(r'n+', line)]
-        return ' '.join(lines)
+        text = text.translate(_CLEAN_TABLE)
+        # Literal \n runs and stray backslashes in a single regex pass
+        text = _LITERAL_BACKSLASH_RE.sub(_literal_backslash_replacement, text)
+        # One pass over the whitespace-split tokens: drop bare quotes, the page title,
+        # and runs of n's (e.g., nnnnn); split() already skips empty tokens
+        tokens = [
+            token for token in text.split()
+            if token not in _SKIP_TOKENS and token != page_title and token.strip('n')
+        ]
+        return ' '.join(tokens)
 
     def _build_two_column_table_html(self, title, data):
-        logger = logging.getLogger(__name__)
-        # Mapping of Smartsheet column IDs to friendly names (now includes RFP Scope and DE Consulting Scope)
-        COLUMNS = [
-            ("5878702367002500", "Project Category"),
-            ("3534360453271428", "Project Name"),
-            ("1375102739632004", "Description"),
-            ("1475623376867204", "Company Name"),
-            ("7911781646421892", "Customer Contact"),
-            ("1611314616291204", "Site Address"),
-            ("3408182019051396", "Opportunity ID"),
-            ("677356797906820", "RFP Scope"),
-            ("1639045752639364", "DE Consulting Scope"),
-        ]
         # Clean the title and values as before
         title = self._clean_text_for_onenote(title)
-        rows = ""
-        for col_id, friendly_name in COLUMNS:
+        parts: List[str] = []
+        # Checked once per page rather than twice per column
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for col_id, friendly_name in _COLUMNS:
             raw_value = data.get(col_id, "")
-            logger.debug(f"Raw value for {friendly_name} ({col_id}): {repr(raw_value)}")
-            # Special handling for DE Consulting Scope (multi-select)
-            if col_id == "1639045752639364":
-                value = raw_value
-                # If value is a dict with a list, join the list
-                if isinstance(value, dict):
-                    v = value.get('displayValue') or value.get('value')
-                    if isinstance(v, list):
-                        value = ', '.join(str(item) for item in v)
-                    else:
-                        value = v or ''
-                elif isinstance(value, list):
-                    value = ', '.join(str(item) for item in value)
-                else:
-                    value = get_display_text(value)
-            else:
-                value = get_display_text(raw_value)
-            logger.debug(f"Display value for {friendly_name}: {repr(value)}")
-            rows += f"<tr><td>{friendly_name}</td><td>{value}</td></tr>"
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-  <title>{title}</title>
-  <meta charset='utf-8' />
-</head>
-<body>
-  <table border='1' cellpadding='5' style='border-collapse:collapse;'>
-    <thead>
-      <tr><th>Field</th><th>Value</th></tr>
-    </thead>
-    <tbody>
-      {rows}
-    </tbody>
-  </table>
-</body>
-</html>
-"""
-        import re
-        # Minify HTML: remove all newlines, carriage returns, and whitespace between tags
-        html = re.sub(r"[\r\n]+", "", html)
-        html = re.sub(r">\s+<", "><", html)
-        html = html.strip()
-        # Remove only leading/trailing quotes
-        if html.startswith('"'):
-            html = html[1:]
-        if html.endswith('"'):
-            html = html[:-1]
-        logger.info(f"Final HTML for OneNote page:\n{html}")
+            value = _COLUMN_FORMATTERS.get(col_id, get_display_text)(raw_value)
+            if debug:
+                logger.debug("Raw value for %s (%s): %r", friendly_name, col_id, raw_value)
+                logger.debug("Display value for %s: %r", friendly_name, value)
+            parts.append(f"<tr><td>{escape(friendly_name)}</td><td>{value}</td></tr>")
+        # Single join over head, rows and tail; the row markup is never copied into an intermediate string
+        html = "".join([_PAGE_HEAD.format(title=escape(title)), *parts, _PAGE_TAIL])
+        logger.debug("Final HTML for OneNote page:\n%s", html)
         return html
 
     def get_section_by_name_site(self, site_id: str, notebook_id: str, section_name: str) -> Optional[Dict[str, Any]]:
@@ -639,14 +1162,15 @@ class OneNoteManager:
         Returns:
             Optional[Dict[str, Any]]: Section information if found, None otherwise
         """
+        cached = self._cache_get(self._section_cache, (notebook_id, section_name))
+        if cached is not None:
+            return cached
         try:
-            response = graph_client.get_site_notebook_sections(site_id, notebook_id)
-            sections = response.get('value', [])
-            
-            for section in sections:
-                if section.get('displayName') == section_name:
-                    logger.info(f"Found section '{section_name}' with ID: {section.get('id')}")
-                    return section
+            section = graph_client.find_section_by_name(site_id, notebook_id, section_name)
+            if section is not None:
+                logger.info(f"Found section '{section_name}' with ID: {section.get('id')}")
+                self._section_cache[(notebook_id, section_name)] = (time.time(), section)
+                return section
             
             logger.info(f"No section found with name '{section_name}' in notebook {notebook_id}")
             return None
@@ -667,14 +1191,17 @@ class OneNoteManager:
         Returns:
             Optional[Dict[str, Any]]: Page information if found, None otherwise
         """
+        cached = self._cache_get(self._page_cache, (section_id, page_title))
+        if cached is not None:
+            return cached
         try:
-            response = graph_client.get_site_notebook_section_pages(site_id, section_id)
+            response = graph_client.get_site_notebook_section_pages(site_id, section_id, title=page_title)
             pages = response.get('value', [])
             
-            for page in pages:
-                if page.get('title') == page_title:
-                    logger.info(f"Found page '{page_title}' with ID: {page.get('id')}")
-                    return page
+            if pages:
+                logger.info(f"Found page '{page_title}' with ID: {pages[0].get('id')}")
+                self._page_cache[(section_id, page_title)] = (time.time(), pages[0])
+                return pages[0]
             
             logger.info(f"No page found with title '{page_title}' in section {section_id}")
             return None
@@ -703,23 +1230,30 @@ class OneNoteManager:
             dict: Info about the created or found page, or error info
         """
         try:
+            page_title = f"{opp_id} - {project_name}" if opp_id else project_name
+            existing_page = None
+            page_known = False
             section = self.get_section_by_name_site(site_id, notebook_id, customer_name)
             if not section:
                 section = graph_client.create_site_notebook_section(site_id, notebook_id, customer_name)
                 if not section or not section.get('id'):
                     logger.error(f"Failed to create/find section '{customer_name}' in Opportunity Notebook {notebook_id}")
                     return {"error": f"Section creation failed: {customer_name}"}
+                self._section_cache[(notebook_id, customer_name)] = (time.time(), section)
+                # A section we just created has no pages yet
+                page_known = True
             section_id = section.get('id')
             if not section_id:
                 logger.error(f"Section ID is None for section '{customer_name}' in Opportunity Notebook {notebook_id}")
                 return {"error": f"Section ID is None for section: {customer_name}"}
-            page_title = f"{opp_id} - {project_name}" if opp_id else project_name
-            existing_page = self.get_page_by_title_site(site_id, section_id, page_title)
+            if not page_known:
+                existing_page = self.get_page_by_title_site(site_id, section_id, page_title)
             if existing_page:
                 logger.info(f"Page '{page_title}' already exists in section '{customer_name}', skipping creation.")
                 return {"skipped": True, "page": existing_page}
             page_html = self._build_full_table_html(page_title, row_data, column_id_to_name=column_id_to_name or {})
             page = graph_client.create_page_in_section(site_id, section_id, page_html)
+            self._page_cache[(section_id, page_title)] = (time.time(), page)
             logger.info(f"Successfully created Opportunity page '{page_title}' in section '{customer_name}'")
             return {"created": True, "page": page}
         except Exception as e:
@@ -739,7 +1273,7 @@ class OneNoteManager:
         title = self._clean_text_for_onenote(title)
         if column_id_to_name is None:
             column_id_to_name = {}
-        rows = ""
+        parts: List[str] = []
         for key, cell in data.items():
             if not isinstance(cell, dict):
                 continue
@@ -748,51 +1282,28 @@ class OneNoteManager:
                 continue
             friendly_name = column_id_to_name.get(key, str(key))
             # Special handling for hyperlink column
-            if key == "1838548451020676" and cell.get('hyperlink'):
+            if key == _HYPERLINK_COLUMN_ID and cell.get('hyperlink'):
                 url = cell['hyperlink'].get('url')
                 label = cell['hyperlink'].get('label') or value
                 if url:
-                    value = f'<a href="{url}">{label}</a>'
+                    value = _LINK_TEMPLATE.format(url=escape(url), label=escape(str(label)))
+                else:
+                    value = escape(str(value))
             elif isinstance(value, dict):
                 name = value.get("name", "")
                 email = value.get("email", "")
                 if name and email:
-                    value = f'<a href="mailto:{email}">{name}</a>'
+                    value = _LINK_TEMPLATE.format(url=f"mailto:{escape(email)}", label=escape(name))
                 elif email:
-                    value = f'<a href="mailto:{email}">{email}</a>'
+                    value = _MAILTO_TEMPLATE.format(email=escape(email))
                 else:
-                    value = json.dumps(value)
+                    value = escape(json.dumps(value))
             else:
-                value = self._clean_text_for_onenote(str(value), page_title=title)
-            rows += f"<tr><td>{friendly_name}</td><td>{value}</td></tr>"
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-  <title>{title}</title>
-  <meta charset='utf-8' />
-</head>
-<body>
-  <table border='1' cellpadding='5' style='border-collapse:collapse;'>
-    <thead>
-      <tr><th>Field</th><th>Value</th></tr>
-    </thead>
-    <tbody>
-      {rows}
-    </tbody>
-  </table>
-</body>
-</html>
-"""
-        import re
-        html = re.sub(r"[\r\n]+", "", html)
-        html = re.sub(r">\s+<", "><", html)
-        html = html.strip()
-        if html.startswith('"'):
-            html = html[1:]
-        if html.endswith('"'):
-            html = html[:-1]
-        logger.info(f"Final HTML for Opportunity OneNote page:\n{html}")
+                value = escape(self._clean_text_for_onenote(str(value), page_title=title))
+            parts.append(f"<tr><td>{escape(friendly_name)}</td><td>{value}</td></tr>")
+        # Single join over head, rows and tail; the row markup is never copied into an intermediate string
+        html = "".join([_PAGE_HEAD.format(title=escape(title)), *parts, _PAGE_TAIL])
+        logger.debug("Final HTML for Opportunity OneNote page:\n%s", html)
         return html
 
 
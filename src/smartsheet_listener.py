@@ -8,18 +8,49 @@ import hashlib
 import hmac
 import logging
 import time
-from typing import Dict, Any, Optional, List
-import smartsheet
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Union
 import traceback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 try:
     from .config import config
     from .storage import StorageManager
+    from .http_session import get_smartsheet_client
 except ImportError:
     from config import config
     from storage import StorageManager
+    from http_session import get_smartsheet_client
 
 logger = logging.getLogger(__name__)
 
+# orjson parses bytes directly; stdlib json is the fallback when it is not installed
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+@dataclass(slots=True)
+class ProjectInfo:
+    """Project fields extracted once per webhook event, plus the row's cells by column ID."""
+    project_id: Any
+    project_type: Any
+    row_id: Optional[int] = None
+    sheet_id: Optional[int] = None
+    modified_at: Optional[str] = None
+    cells: Dict[str, Any] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flatten into a single dict of the fixed fields and all cells keyed by column ID."""
+        return {
+            'project_id': self.project_id,
+            'project_type': self.project_type,
+            'row_id': self.row_id,
+            'sheet_id': self.sheet_id,
+            'modified_at': self.modified_at,
+            **self.cells
+        }
+
 
 def get_column_id_to_name(client, sheet_id: int) -> dict:
     """
@@ -45,8 +76,8 @@ class SmartsheetListener:
             logger.warning("No Smartsheet token provided, client will not be initialized")
             self.client = None
         else:
-            self.client = smartsheet.Smartsheet(config.SMTSHEET_TOKEN)
-            self.client.errors_as_exceptions(True)
+            # Shared with the updater so both reuse one SDK connection pool
+            self.client = get_smartsheet_client(config.SMTSHEET_TOKEN)
         
         # Initialize storage manager for webhook deduplication
         self.storage_manager = StorageManager()
@@ -55,25 +86,29 @@ class SmartsheetListener:
         self._processed_webhooks = {}  # webhook_signature -> timestamp
         self._webhook_cache_ttl = 300  # 5 minutes cache TTL
     
-    def validate_webhook(self, payload: str, signature: str, webhook_secret: str) -> bool:
+    def validate_webhook(self, payload: Union[str, bytes], signature: str, webhook_secret: Union[str, bytes]) -> bool:
         """
         Validate Smartsheet webhook signature.
         
         Args:
-            payload: Raw webhook payload
+            payload: Raw webhook payload (bytes are signed as-is)
             signature: Webhook signature header
-            webhook_secret: Webhook secret for validation
+            webhook_secret: Webhook secret for validation (str or UTF-8 bytes)
             
         Returns:
             bool: True if signature is valid, False otherwise
         """
         try:
-            # Create expected signature
-            expected_signature = hmac.new(
-                webhook_secret.encode('utf-8'),
-                payload.encode('utf-8'),
+            # Create expected signature; one-shot HMAC over the raw bytes stays in OpenSSL
+            if isinstance(payload, str):
+                payload = payload.encode('utf-8')
+            if isinstance(webhook_secret, str):
+                webhook_secret = webhook_secret.encode('utf-8')
+            expected_signature = hmac.digest(
+                webhook_secret,
+                payload,
                 hashlib.sha256
-            ).hexdigest()
+            ).hex()
             
             # Compare signatures
             is_valid = hmac.compare_digest(signature, expected_signature)
@@ -89,12 +124,12 @@ class SmartsheetListener:
             logger.error(f"Error validating webhook signature: {e}")
             return False
     
-    def parse_webhook_payload(self, payload: str) -> Dict[str, Any]:
+    def parse_webhook_payload(self, payload: Union[str, bytes]) -> Dict[str, Any]:
         """
         Parse webhook payload and extract relevant information.
         
         Args:
-            payload: Raw webhook payload
+            payload: Raw webhook payload (str or UTF-8 bytes)
             
         Returns:
             Dict[str, Any]: Parsed webhook data
@@ -103,7 +138,7 @@ class SmartsheetListener:
             ValueError: If payload cannot be parsed
         """
         try:
-            data = json.loads(payload)
+            data = _json_loads(payload)
             logger.info(f"Successfully parsed webhook payload: {data.get('eventType', 'unknown')}")
             return data
             
@@ -479,12 +514,12 @@ class SmartsheetListener:
             logger.error(f"Error checking if row has changed: {e}")
             return False
     
-    def process_webhook_event(self, payload: str, signature: Optional[str] = None, webhook_secret: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    def process_webhook_event(self, payload: Union[str, bytes], signature: Optional[str] = None, webhook_secret: Optional[Union[str, bytes]] = None) -> Optional[Dict[str, Any]]:
         """
         Process a complete webhook event.
         
         Args:
-            payload: Raw webhook payload
+            payload: Raw webhook payload (str or UTF-8 bytes)
             signature: Webhook signature (optional)
             webhook_secret: Webhook secret for validation (optional)
             
@@ -493,7 +528,7 @@ class SmartsheetListener:
         """
         try:
             logger.info("Starting webhook event processing")
-            logger.info(f"Payload length: {len(payload)} characters")
+            logger.info(f"Payload length: {len(payload)}")
             
             if signature and webhook_secret:
                 logger.info("Validating webhook signature...")
@@ -624,15 +659,15 @@ class SmartsheetListener:
                 logger.info("Missing project_id or project_type, ignoring event")
                 return None
             
-            # Add all cell values by column ID to project_info
-            project_info = {
-                'project_id': project_id,
-                'project_type': project_type,
-                'row_id': row_data.get('row_id'),
-                'sheet_id': row_data.get('sheet_id'),
-                'modified_at': row_data.get('modified_at'),
-                **cells  # <-- add all cell values by column ID
-            }
+            # Keep all cell values by column ID alongside the typed fields
+            project_info = ProjectInfo(
+                project_id=project_id,
+                project_type=project_type,
+                row_id=row_data.get('row_id'),
+                sheet_id=row_data.get('sheet_id'),
+                modified_at=row_data.get('modified_at'),
+                cells=cells
+            )
             
             result = {
                 'type': 'closed_won_deal',
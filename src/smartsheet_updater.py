@@ -3,14 +3,25 @@ Smartsheet updater module for updating rows with OneNote URLs.
 """
 
 import os
+import json
 import logging
-import smartsheet
-import requests
 from typing import Dict, Any, Optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from src.config import config
+from src.http_session import get_shared_session, get_smartsheet_client
 
 logger = logging.getLogger(__name__)
 
+# orjson encodes straight to bytes; stdlib json is the fallback when it is not installed
+if orjson is not None:
+    _json_dumps = orjson.dumps
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 def get_display_text(cell):
     """
     Extract the display value for a cell, or value, or empty string.
@@ -45,8 +56,11 @@ class SmartsheetUpdater:
         if not self.token:
             raise ValueError("SMTSHEET_TOKEN is required")
         
-        self.client = smartsheet.Smartsheet(self.token)
-        self.client.errors_as_exceptions(True)
+        # Process-wide SDK client, shared with the webhook listener
+        self.client = get_smartsheet_client(self.token)
+        
+        # Package-wide pooled session for raw row updates (reuses keep-alive connections)
+        self.session = get_shared_session()
         
         # Column ID for "Public Notebook" column
         self.public_notebook_column_id = 3086497829048196
@@ -118,7 +132,7 @@ class SmartsheetUpdater:
             }
             
             url = f"https://api.smartsheet.com/2.0/sheets/{sheet_id}/rows"
-            response = requests.put(url, headers=headers, json=payload)
+            response = self.session.put(url, headers=headers, data=_json_dumps(payload))
             
             if response.status_code == 200:
                 logger.info(f"Successfully updated Smartsheet row {row_id} with OneNote URL")
@@ -201,7 +215,7 @@ class SmartsheetUpdater:
             }
             
             url = f"https://api.smartsheet.com/2.0/sheets/{sheet_id}/rows"
-            response = requests.put(url, headers=headers, json=payload)
+            response = self.session.put(url, headers=headers, data=_json_dumps(payload))
             
             if response.status_code == 200:
                 logger.info(f"Successfully updated Smartsheet row {row_id} with Submittals folder URL")
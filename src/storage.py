@@ -4,8 +4,9 @@ Provides functions to retrieve template folder IDs based on project categories.
 """
 
 import logging
-from typing import List, Optional, Dict, Any
-from azure.data.tables import TableServiceClient
+import time
+from typing import List, Optional, Dict, Any, Tuple, Iterable
+from azure.data.tables import TableServiceClient, TableTransactionError
 from azure.core.exceptions import ResourceNotFoundError, AzureError
 from datetime import datetime, timedelta
 try:
@@ -15,10 +16,40 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Table service clients keyed by connection string, so every storage wrapper in
+# the process shares one connection pool
+_table_services: Dict[str, TableServiceClient] = {}
+
+
+def get_table_service(connection_string: str) -> TableServiceClient:
+    """
+    Get the shared TableServiceClient for a connection string, creating it on first use.
+    
+    Args:
+        connection_string: Azure Storage connection string
+        
+    Returns:
+        TableServiceClient: Shared table service client
+    """
+    table_service = _table_services.get(connection_string)
+    if table_service is None:
+        table_service = TableServiceClient.from_connection_string(connection_string)
+        _table_services[connection_string] = table_service
+    return table_service
+
+
+# Azure Tables accepts at most 100 operations per entity-group transaction
+TRANSACTION_MAX_OPERATIONS = 100
+
+# Template attributes exposed in webhook responses
+TEMPLATE_FIELDS = ("partition_key", "row_key", "template_folder_id", "site_id")
+
 
 class Template:
     """Template mapping data class."""
     
+    __slots__ = TEMPLATE_FIELDS + ("drive_id",)
+    
     def __init__(self, partition_key: str, row_key: str, template_folder_id: str, site_id: Optional[str] = None, drive_id: Optional[str] = None):
         """
         Initialize a Template instance.
@@ -65,6 +96,10 @@ class StorageClient:
         self.table_name = config.TEMPLATE_MAPPING_TABLE
         self.table_service = None
         self.table_client = None
+        # Short-lived read caches; lookup key -> (cached_at, value)
+        self._cache_ttl = 60  # seconds
+        self._templates_cache: Dict[str, Tuple[float, List[Template]]] = {}
+        self._project_cache: Dict[str, Tuple[float, Project]] = {}
         self._initialize_client()
     
     def _initialize_client(self):
@@ -76,9 +111,7 @@ class StorageClient:
                 self.table_client = None
                 return
                 
-            self.table_service = TableServiceClient.from_connection_string(
-                self.connection_string
-            )
+            self.table_service = get_table_service(self.connection_string)
             self.table_client = self.table_service.get_table_client(self.table_name)
             logger.info(f"Successfully initialized table client for '{self.table_name}'")
         except Exception as e:
@@ -100,6 +133,10 @@ class StorageClient:
         Raises:
             Exception: If table operation fails
         """
+        cached = self._templates_cache.get(category)
+        if cached and time.time() - cached[0] < self._cache_ttl:
+            return list(cached[1])
+        
         try:
             if not self.table_client:
                 logger.warning("Table client not initialized, cannot get templates")
@@ -121,7 +158,8 @@ class StorageClient:
                 templates.append(template)
             
             logger.info(f"Retrieved {len(templates)} templates for category '{category}'")
-            return templates
+            self._templates_cache[category] = (time.time(), templates)
+            return list(templates)
             
         except ResourceNotFoundError:
             logger.warning(f"No templates found for category '{category}'")
@@ -205,6 +243,40 @@ class StorageClient:
             logger.error(f"Failed to list categories: {e}")
             raise Exception(f"Failed to list categories: {e}")
     
+    def list_all_templates(self) -> List[Template]:
+        """
+        Get every template mapping in a single table scan.
+        
+        Returns:
+            List[Template]: All templates (only category, name and folder ID are populated)
+            
+        Raises:
+            Exception: If table operation fails
+        """
+        try:
+            if not self.table_client:
+                logger.warning("Table client not initialized, cannot list templates")
+                return []
+            
+            # Project only the columns needed to keep the scan small
+            entities = self.table_client.list_entities(
+                select=["PartitionKey", "RowKey", "templateFolderId"]
+            )
+            templates = [
+                Template(
+                    partition_key=entity.get("PartitionKey") or "",
+                    row_key=entity.get("RowKey") or "",
+                    template_folder_id=entity.get("templateFolderId") or ""
+                )
+                for entity in entities
+            ]
+            logger.info(f"Retrieved {len(templates)} templates across all categories")
+            return templates
+            
+        except AzureError as e:
+            logger.error(f"Failed to list templates: {e}")
+            raise Exception(f"Failed to list templates: {e}")
+    
     def add_template(self, category: str, template_name: str, template_folder_id: str, site_id: Optional[str] = None, drive_id: Optional[str] = None) -> bool:
         """
         Add a new template mapping.
@@ -238,6 +310,7 @@ class StorageClient:
                 entity["DriveID"] = drive_id
             
             self.table_client.create_entity(entity)
+            self._templates_cache.pop(category, None)
             logger.info(f"Successfully added template '{template_name}' for category '{category}'")
             return True
             
@@ -282,6 +355,7 @@ class StorageClient:
                 # If update fails (e.g., entity does not exist), try upsert
                 logger.warning(f"Update failed, trying upsert: {e}")
                 self.table_client.upsert_entity(entity)
+            self._templates_cache.pop(category, None)
             logger.info(f"Successfully updated or upserted template '{template_name}' for category '{category}'")
             return True
         except AzureError as e:
@@ -311,6 +385,7 @@ class StorageClient:
                 partition_key=category,
                 row_key=template_name
             )
+            self._templates_cache.pop(category, None)
             logger.info(f"Successfully deleted template '{template_name}' for category '{category}'")
             return True
             
@@ -365,6 +440,56 @@ class StorageClient:
             logger.error(f"Failed to seed template data: {e}")
             return False
 
+    def seed_template_data_batched(self, chunks: Iterable[List[Dict[str, str]]]) -> bool:
+        """
+        Seed template data using entity-group transactions.
+        
+        Args:
+            chunks: Lists of template dictionaries (same keys as seed_template_data); every
+                    template in a chunk must share a category and a chunk holds at most
+                    TRANSACTION_MAX_OPERATIONS templates
+                    
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            if not self.table_client:
+                logger.warning("Table client not initialized, cannot seed templates")
+                return False
+            
+            total = 0
+            for chunk in chunks:
+                entities = []
+                for template in chunk:
+                    entity = {
+                        "PartitionKey": template['category'],
+                        "RowKey": template['template_name'],
+                        "templateFolderId": template['template_folder_id']
+                    }
+                    if template.get('site_id'):
+                        entity["SiteID"] = template['site_id']
+                    if template.get('drive_id'):
+                        entity["DriveID"] = template['drive_id']
+                    entities.append(entity)
+                if not entities:
+                    continue
+                try:
+                    self.table_client.submit_transaction([("upsert", entity) for entity in entities])
+                except TableTransactionError as e:
+                    # The whole transaction is rejected; retry this slice one entity at a time
+                    logger.warning(f"Transaction failed for category '{entities[0]['PartitionKey']}', falling back to per-entity upsert: {e}")
+                    for entity in entities:
+                        self.table_client.upsert_entity(entity)
+                self._templates_cache.pop(entities[0]["PartitionKey"], None)
+                total += len(entities)
+            
+            logger.info(f"Successfully seeded {total} template mappings")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to seed template data: {e}")
+            return False
+    
     def get_project_by_type(self, project_type: str) -> Optional[Project]:
         """
         Get a project by ProjectType (RowKey) from BVCSSProjects table.
@@ -373,6 +498,10 @@ class StorageClient:
         Returns:
             Optional[Project]: Project if found, None otherwise
         """
+        cached = self._project_cache.get(project_type)
+        if cached and time.time() - cached[0] < self._cache_ttl:
+            return cached[1]
+        
         try:
             if not self.table_service:
                 logger.warning("Table service not initialized, cannot get project")
@@ -392,6 +521,7 @@ class StorageClient:
                 site_id=entity.get("SiteID") or ""
             )
             logger.info(f"Retrieved project for type '{project_type}': {project}")
+            self._project_cache[project_type] = (time.time(), project)
             return project
         except ResourceNotFoundError:
             logger.warning(f"Project not found for type '{project_type}' in BVCSSProjects")
@@ -413,9 +543,7 @@ class StorageManager:
             logger.warning("No storage connection string provided")
             self.table_service = None
         else:
-            self.table_service = TableServiceClient.from_connection_string(
-                config.STORAGE_CONNECTION_STRING
-            )
+            self.table_service = get_table_service(config.STORAGE_CONNECTION_STRING)
     
     def _ensure_webhook_table_exists(self) -> bool:
         """
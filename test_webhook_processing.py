@@ -52,8 +52,9 @@ def test_cell_update_webhook():
         if result:
             print(f"✅ Webhook processing successful!")
             print(f"Result type: {result.get('type')}")
-            print(f"Project ID: {result.get('project_info', {}).get('project_id')}")
-            print(f"Project Type: {result.get('project_info', {}).get('project_type')}")
+            project_info = result.get('project_info')
+            print(f"Project ID: {getattr(project_info, 'project_id', None)}")
+            print(f"Project Type: {getattr(project_info, 'project_type', None)}")
             return True
         else:
             print("❌ Webhook processing returned None")
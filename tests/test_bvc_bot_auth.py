@@ -0,0 +1,40 @@
+"""
+Tests for the BVC bot token persistence helpers.
+"""
+
+import os
+import stat
+from unittest.mock import patch
+from dotenv import dotenv_values
+from src import bvc_bot_auth
+
+
+class TestSaveEnvVars:
+    """Test cases for save_env_vars."""
+    
+    def test_rewrites_only_token_lines(self, tmp_path):
+        """Test that other lines, comments, quoting and file mode survive a token save."""
+        env_path = tmp_path / ".env"
+        env_path.write_text(
+            "# secrets\n"
+            "BVC_SERVICE_BOT_PW='p@ss #word'\n"
+            "OUTPUT_DIR=${HOME}/x\n"
+            "BVC_BOT_ACCESS_TOKEN=old\n"
+        )
+        os.chmod(env_path, 0o600)
+        
+        with patch.object(bvc_bot_auth, 'ENV_PATH', str(env_path)):
+            bvc_bot_auth.save_env_vars({
+                'BVC_BOT_ACCESS_TOKEN': "new'token\\",
+                'BVC_BOT_REFRESH_TOKEN': 'refresh',
+                'UNCHANGED': None
+            })
+        
+        lines = env_path.read_text().splitlines()
+        assert lines[:3] == ["# secrets", "BVC_SERVICE_BOT_PW='p@ss #word'", "OUTPUT_DIR=${HOME}/x"]
+        values = dotenv_values(env_path, interpolate=False)
+        assert values['BVC_SERVICE_BOT_PW'] == 'p@ss #word'
+        assert values['BVC_BOT_ACCESS_TOKEN'] == "new'token\\"
+        assert values['BVC_BOT_REFRESH_TOKEN'] == 'refresh'
+        assert 'UNCHANGED' not in values
+        assert stat.S_IMODE(os.stat(env_path).st_mode) == 0o600
@@ -2,9 +2,13 @@
 Tests for Microsoft Graph API client module.
 """
 
+import threading
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from src.graph_client import GraphClient, graph_client
+from concurrent.futures import ThreadPoolExecutor
+from src.graph_client import GraphClient, graph_client, submit_in_context
+from src.http_session import get_shared_session
 
 
 class TestGraphClient:
@@ -69,9 +73,43 @@ class TestGraphClient:
         with pytest.raises(Exception, match="Failed to acquire token"):
             client.get_access_token()
     
+    @patch('src.graph_client.config')
+    @patch('msal.PublicClientApplication')
+    @patch('msal.ConfidentialClientApplication')
+    def test_concurrent_delegated_refreshes_coalesce(self, mock_msal_app, mock_public_app, mock_config):
+        """Test that concurrent delegated refreshes share one MSAL round trip."""
+        mock_config.BVC_ONENOTE_INGEST_BOT_ID = 'test_bot_id'
+        mock_config.BVC_BOT_REFRESH_TOKEN = 'test_refresh_token'
+        
+        release = threading.Event()
+        
+        def slow_refresh(*args, **kwargs):
+            release.wait(timeout=5)
+            return {'access_token': 'delegated_token', 'expires_in': 3600}
+        
+        mock_public_instance = Mock()
+        mock_public_instance.acquire_token_by_refresh_token.side_effect = slow_refresh
+        mock_public_app.return_value = mock_public_instance
+        
+        client = GraphClient()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.refresh_delegated_token()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        assert results == ['delegated_token'] * 4
+        mock_public_instance.acquire_token_by_refresh_token.assert_called_once()
+    
     @patch('src.config.config')
     @patch('msal.ConfidentialClientApplication')
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_graph_request_success(self, mock_request, mock_msal_app, mock_config):
         """Test successful Graph API request."""
         # Setup mocks
@@ -91,7 +129,7 @@ class TestGraphClient:
         
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {'id': 'test_id', 'name': 'test_name'}
+        mock_response.content = b'{"id": "test_id", "name": "test_name"}'
         mock_request.return_value = mock_response
         
         client = GraphClient()
@@ -102,7 +140,7 @@ class TestGraphClient:
     
     @patch('src.config.config')
     @patch('msal.ConfidentialClientApplication')
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_graph_request_failure(self, mock_request, mock_msal_app, mock_config):
         """Test Graph API request failure."""
         # Setup mocks
@@ -167,7 +205,7 @@ class TestGraphClient:
                 }
             )
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_copy_status_in_progress(self, mock_get):
         """Test copy status check when operation is in progress."""
         mock_response = Mock()
@@ -179,12 +217,12 @@ class TestGraphClient:
         
         assert result == {'status': 'inProgress'}
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_copy_status_completed(self, mock_get):
         """Test copy status check when operation is completed."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {'id': 'completed_item_id'}
+        mock_response.content = b'{"id": "completed_item_id"}'
         mock_get.return_value = mock_response
         
         client = GraphClient()
@@ -192,6 +230,21 @@ class TestGraphClient:
         
         assert result == {'id': 'completed_item_id'}
     
+    @patch('time.sleep')
+    def test_wait_for_copy_completion_backs_off(self, mock_sleep):
+        """Test that copy polling backs off between in-progress checks."""
+        client = GraphClient()
+        statuses = [{'status': 'notStarted'}, {'status': 'inProgress'}, {'status': 'inProgress'}, {'id': 'new_item'}]
+        
+        with patch.object(client, 'get_copy_status', side_effect=statuses):
+            result = client.wait_for_copy_completion('https://example.com/monitor', timeout=60)
+        
+        assert result == {'id': 'new_item'}
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        assert len(delays) == 3
+        assert delays[0] < 0.5
+        assert all(d <= 7.5 for d in delays)
+    
     @patch('src.config.config')
     @patch('msal.ConfidentialClientApplication')
     def test_get_drive_items(self, mock_msal_app, mock_config):
@@ -225,6 +278,99 @@ class TestGraphClient:
             assert result == {'value': [{'id': 'item1'}, {'id': 'item2'}]}
             mock_graph_request.assert_called_with('GET', '/drives/test_drive_id/root/children')
 
+    
+    @patch('src.config.config')
+    @patch('msal.ConfidentialClientApplication')
+    def test_graph_batch_chunks_requests(self, mock_msal_app, mock_config):
+        """Test that graph_batch splits sub-requests into chunks of 20."""
+        client = GraphClient()
+        sub_requests = [
+            {'id': str(i), 'method': 'GET', 'url': f'/drives/d/items/{i}/children'}
+            for i in range(25)
+        ]
+        
+        def fake_batch(method, endpoint, data=None):
+            return {'responses': [
+                {'id': r['id'], 'status': 200, 'body': {}} for r in data['requests']
+            ]}
+        
+        with patch.object(client, 'graph_request', side_effect=fake_batch) as mock_graph_request:
+            result = client.graph_batch(sub_requests)
+            
+            assert mock_graph_request.call_count == 2
+            assert len(mock_graph_request.call_args_list[0][1]['data']['requests']) == 20
+            assert len(mock_graph_request.call_args_list[1][1]['data']['requests']) == 5
+            assert set(result) == {str(i) for i in range(25)}
+
+    @patch('time.sleep')
+    @patch('src.config.config')
+    @patch('msal.ConfidentialClientApplication')
+    def test_graph_batch_resends_504_only_for_gets(self, mock_msal_app, mock_config, mock_sleep):
+        """Test that a 504 GET sub-request is resent but a 504 POST, which may have applied, is not."""
+        client = GraphClient()
+        sub_requests = [
+            {'id': 'get', 'method': 'GET', 'url': '/sites/s/onenote/sections/x/pages'},
+            {'id': 'post', 'method': 'POST', 'url': '/sites/s/onenote/sections/x/pages', 'body': {}}
+        ]
+        first = {'responses': [{'id': 'get', 'status': 504}, {'id': 'post', 'status': 504}]}
+        second = {'responses': [{'id': 'get', 'status': 200, 'body': {'value': []}}]}
+
+        with patch.object(client, 'graph_request', side_effect=[first, second]) as mock_graph_request:
+            result = client.graph_batch(sub_requests)
+
+            assert mock_graph_request.call_count == 2
+            assert [r['id'] for r in mock_graph_request.call_args_list[1][1]['data']['requests']] == ['get']
+            assert result['get']['status'] == 200
+            assert result['post']['status'] == 504
+
+    @patch('src.config.config')
+    @patch('msal.ConfidentialClientApplication')
+    def test_graph_request_caches_gets_until_write(self, mock_msal_app, mock_config):
+        """Test that repeated GETs are served from cache and a POST to the same path evicts them."""
+        session = Mock()
+        response = Mock(status_code=200, content=b'{"value": []}')
+        response.json.return_value = {'value': []}
+        session.request.return_value = response
+        client = GraphClient(session=session)
+        
+        with patch.object(client, 'get_access_token', return_value='token'):
+            client.graph_request('GET', '/sites/s/onenote/notebooks')
+            client.graph_request('GET', '/sites/s/onenote/notebooks')
+            assert session.request.call_count == 1
+            
+            client.graph_request('GET', '/sites/s/onenote/notebooks', no_cache=True)
+            assert session.request.call_count == 2
+            
+            client.graph_request('POST', '/sites/s/onenote/notebooks', data={'displayName': 'n'})
+            client.graph_request('GET', '/sites/s/onenote/notebooks')
+            assert session.request.call_count == 4
+
+    @patch('src.config.config')
+    @patch('msal.ConfidentialClientApplication')
+    def test_request_id_sent_from_worker_threads(self, mock_msal_app, mock_config):
+        """Test that Graph calls submitted to a pool send the submitting context's client-request-id."""
+        session = Mock()
+        session.request.return_value = Mock(status_code=200, content=b'{}')
+        client = GraphClient(session=session)
+
+        client.set_request_id('request-1')
+        try:
+            with patch.object(client, 'get_access_token', return_value='token'), \
+                    ThreadPoolExecutor(max_workers=1) as executor:
+                submit_in_context(executor, client.graph_request, 'GET', '/sites/s', no_cache=True).result()
+        finally:
+            client.set_request_id(None)
+
+        assert session.request.call_args[1]['headers']['client-request-id'] == 'request-1'
+
+    def test_session_retries_throttled_writes_only(self):
+        """Test that the pooled session resends a POST on 429/503 but not on a 504 it may have applied."""
+        retry = get_shared_session().get_adapter('https://graph.microsoft.com').max_retries
+        
+        assert retry.is_retry('POST', 429)
+        assert retry.is_retry('POST', 503, has_retry_after=True)
+        assert not retry.is_retry('POST', 504)
+        assert retry.is_retry('GET', 504)
 
 class TestGraphClientIntegration:
     """Integration test cases for GraphClient."""
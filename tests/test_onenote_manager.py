@@ -0,0 +1,152 @@
+"""
+Tests for the batched OneNote bulk_ensure path.
+"""
+
+import base64
+import html
+import re
+import time
+import pytest
+from unittest.mock import patch
+from urllib.parse import urlsplit, parse_qs
+from src.graph_client import graph_client
+from src.onenote_manager import OneNoteManager
+
+SITE = 'site'
+
+
+def _row(customer, project, opp_id):
+    """Build a Smartsheet row with the customer, project name and opportunity ID columns."""
+    return {'1475623376867204': customer, '3534360453271428': project, '3408182019051396': opp_id}
+
+
+class FakeGraph:
+    """In-memory stand-in for the OneNote endpoints that bulk_ensure reaches through graph_batch."""
+    
+    def __init__(self):
+        self.notebooks = {}
+        self.sections = {}
+        self.pages = {}
+        self.requests = []
+        # (method, kind) -> status returned instead of 201; the write is still applied
+        self.overrides = {}
+    
+    def graph_batch(self, sub_requests, delegated=False):
+        self.requests.extend(sub_requests)
+        return {r['id']: self._handle(r['method'], r['url'], r.get('body')) for r in sub_requests}
+    
+    def section_pages(self, site_id, section_id, title=None):
+        page = self.pages.get((section_id, title))
+        return {'value': [page] if page else []}
+    
+    def posts(self, kind):
+        return [r for r in self.requests if r['method'] == 'POST' and r['url'].endswith(f"/{kind}")]
+    
+    def _handle(self, method, url, body):
+        parts = urlsplit(url)
+        parent, kind = parts.path.strip('/').split('/')[-2:]
+        if method == 'GET':
+            name = re.search(r"eq '(.*)'$", parse_qs(parts.query)['$filter'][0]).group(1).replace("''", "'")
+            return {'status': 200, 'body': {'value': self._find(kind, parent, name)}}
+        return {'status': self.overrides.get((method, kind), 201), 'body': self._create(kind, parent, body)}
+    
+    def _find(self, kind, parent, name):
+        if kind == 'notebooks':
+            notebook = self.notebooks.get(name)
+            if notebook is None:
+                return []
+            sections = [s for (nb_id, _), s in self.sections.items() if nb_id == notebook['id']]
+            return [{**notebook, 'sections': sections}]
+        store = self.sections if kind == 'sections' else self.pages
+        found = store.get((parent, name))
+        return [found] if found else []
+    
+    def _create(self, kind, parent, body):
+        item_id = f"{kind}-{len(self.notebooks) + len(self.sections) + len(self.pages)}"
+        if kind == 'notebooks':
+            self.notebooks[body['displayName']] = {'id': item_id, 'displayName': body['displayName']}
+            return self.notebooks[body['displayName']]
+        if kind == 'sections':
+            self.sections[(parent, body['displayName'])] = {'id': item_id, 'displayName': body['displayName']}
+            return self.sections[(parent, body['displayName'])]
+        page_html = base64.b64decode(body).decode('utf-8')
+        title = html.unescape(re.search(r'<title>(.*?)</title>', page_html).group(1))
+        self.pages[(parent, title)] = {'id': item_id, 'title': title}
+        return self.pages[(parent, title)]
+
+
+@pytest.fixture
+def fake():
+    """Route graph_batch and the per-item page lookup through a FakeGraph."""
+    graph = FakeGraph()
+    with patch.object(graph_client, 'graph_batch', side_effect=graph.graph_batch), \
+            patch.object(graph_client, 'get_site_notebook_section_pages', side_effect=graph.section_pages):
+        yield graph
+
+
+class TestBulkEnsure:
+    """Test cases for OneNoteManager.bulk_ensure."""
+    
+    def test_creates_everything_and_keeps_row_order(self, fake):
+        """Test that missing notebooks, sections and pages are created and results follow the rows."""
+        rows = [_row('Acme', 'One', 'O1'), _row('Beta', 'Two', 'O2'), _row('Acme', 'Three', 'O3')]
+        
+        results = OneNoteManager().bulk_ensure(SITE, rows)
+        
+        assert [r['page']['title'] for r in results] == ['O1 - One', 'O2 - Two', 'O3 - Three']
+        assert [r['notebook_name'] for r in results] == ['Acme - Public', 'Beta - Public', 'Acme - Public']
+        assert len(fake.posts('notebooks')) == 2
+        assert len(fake.posts('sections')) == 3
+        assert len(fake.posts('pages')) == 3
+        # Sections created in this run have no pages, so no page lookups are sent
+        assert not [r for r in fake.requests if r['method'] == 'GET' and '/pages' in r['url']]
+    
+    def test_finds_existing_items_without_creating(self, fake):
+        """Test that a second run over the same rows finds everything and creates nothing."""
+        rows = [_row('Acme', 'One', 'O1'), _row('Acme', 'Two', 'O2')]
+        first = OneNoteManager().bulk_ensure(SITE, rows)
+        fake.requests.clear()
+        
+        second = OneNoteManager().bulk_ensure(SITE, rows)
+        
+        assert [r['page'] for r in second] == [r['page'] for r in first]
+        assert not [r for r in fake.requests if r['method'] == 'POST']
+    
+    def test_serves_cached_rows_without_graph_calls(self, fake):
+        """Test that rows whose notebook, section and page are cached need no batch at all."""
+        manager = OneNoteManager()
+        now = time.time()
+        page = {'id': 'page-1', 'title': 'O1 - One'}
+        manager._site_notebook_cache[(SITE, 'Acme - Public')] = (now, {'id': 'nb-1', 'displayName': 'Acme - Public'})
+        manager._section_cache[('nb-1', 'O1 - One')] = (now, {'id': 'sec-1', 'displayName': 'O1 - One'})
+        manager._page_cache[('sec-1', 'O1 - One')] = (now, page)
+        
+        results = manager.bulk_ensure(SITE, [_row('Acme', 'One', 'O1')])
+        
+        assert results[0]['page'] == page
+        assert fake.requests == []
+    
+    def test_notebook_conflict_falls_back_to_sequential_path(self, fake):
+        """Test that a notebook create the batch could not settle goes through _ensure_site_notebook."""
+        fake.overrides[('POST', 'notebooks')] = 409
+        manager = OneNoteManager()
+        existing = {'id': 'nb-existing', 'displayName': 'Acme - Public'}
+        
+        with patch.object(manager, '_ensure_site_notebook', return_value=existing) as ensure_notebook:
+            results = manager.bulk_ensure(SITE, [_row('Acme', 'One', 'O1')])
+        
+        ensure_notebook.assert_called_once_with(SITE, 'Acme - Public')
+        assert results[0]['notebook'] == existing
+        assert results[0]['page']['title'] == 'O1 - One'
+    
+    @pytest.mark.parametrize('status, recreated', [(500, False), (400, True)])
+    def test_failed_page_create_is_looked_up_unless_rejected(self, fake, status, recreated):
+        """Test that a page create that may have applied is looked up before being re-created."""
+        fake.overrides[('POST', 'pages')] = status
+        
+        with patch.object(graph_client, 'create_page_in_section', return_value={'id': 'page-retry'}) as create_page:
+            results = OneNoteManager().bulk_ensure(SITE, [_row('Acme', 'One', 'O1')])
+        
+        # The fake applies the write either way: after a 500 the page is found, not duplicated
+        assert create_page.called == recreated
+        assert results[0]['page'] == ({'id': 'page-retry'} if recreated else fake.pages[(results[0]['section']['id'], 'O1 - One')])
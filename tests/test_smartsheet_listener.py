@@ -0,0 +1,32 @@
+"""
+Tests for Smartsheet webhook listener module.
+"""
+
+import hashlib
+import hmac
+import pytest
+from src.smartsheet_listener import smartsheet_listener
+
+
+class TestWebhookValidation:
+    """Test cases for webhook signature validation and parsing."""
+    
+    def test_validate_webhook_bytes_payload(self):
+        """Test that signatures are computed over the raw payload bytes."""
+        payload = b'{"eventType": "WEBHOOK_CHALLENGE"}'
+        signature = hmac.new(b'secret', payload, hashlib.sha256).hexdigest()
+        
+        assert smartsheet_listener.validate_webhook(payload, signature, 'secret')
+        assert smartsheet_listener.validate_webhook(payload.decode('utf-8'), signature, 'secret')
+        assert smartsheet_listener.validate_webhook(payload, signature, b'secret')
+        assert not smartsheet_listener.validate_webhook(payload, signature, 'other')
+    
+    def test_parse_webhook_payload_bytes(self):
+        """Test parsing a payload passed as bytes."""
+        data = smartsheet_listener.parse_webhook_payload(b'{"eventType": "x", "webhookId": 1}')
+        assert data == {'eventType': 'x', 'webhookId': 1}
+    
+    def test_parse_webhook_payload_invalid(self):
+        """Test that invalid JSON raises ValueError."""
+        with pytest.raises(ValueError):
+            smartsheet_listener.parse_webhook_payload(b'{not json')
@@ -0,0 +1,36 @@
+"""
+Azure Functions warmup trigger.
+Runs when a new instance is added (Premium / Dedicated plans) so the heavy
+application imports, HTTP sessions and the app-only Graph token are ready
+before the first webhook is routed to the instance.
+"""
+
+import logging
+import azure.functions as func
+
+logger = logging.getLogger(__name__)
+
+
+def main(warmupContext: func.Context) -> None:
+    """
+    Preload application modules and shared clients.
+    
+    Args:
+        warmupContext: Warmup trigger context
+    """
+    logger.info("Warmup trigger started")
+    try:
+        import requests.adapters  # noqa: F401
+        import msal  # noqa: F401
+        from src.folder_manager import folder_manager  # noqa: F401
+        from src.onenote_manager import onenote_manager  # noqa: F401
+        from src.storage import storage_client
+        from src.graph_client import graph_client
+        
+        _ = storage_client.table_service
+        _ = graph_client.session
+        graph_client.get_access_token()
+        logger.info("Warmup completed")
+    except Exception as e:
+        # Warmup is best effort; the HTTP function initializes on demand anyway
+        logger.warning("Warmup did not complete: %s", e)